@@ -1,13 +1,24 @@
 import json
 import argparse
+import mmap
+import sys
+from bisect import bisect_left
 from collections import Counter
-import math
+from operator import itemgetter, sub
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser
+    orjson = None
 
 # --- Constants ---
 POINTS_PER_INCH = 72
 DEFAULT_PAGE_HEIGHT = 11 * POINTS_PER_INCH  # US Letter default
 HEADER_ZONE_INCHES = 1.25
 FOOTER_ZONE_INCHES = 1.0
+# Zone limits in points, derived once rather than per page
+HEADER_MAX_Y = HEADER_ZONE_INCHES * POINTS_PER_INCH  # Lines starting above this are in the header zone
+FOOTER_ZONE_HEIGHT = FOOTER_ZONE_INCHES * POINTS_PER_INCH  # Measured up from the page bottom
 # Spacing multipliers (relative to typical body spacing)
 # Gap must be > this * body_spacing to be considered 'large' (header/footer break)
 LARGE_GAP_MULTIPLIER = 1.8
@@ -18,214 +29,159 @@ SMALL_GAP_MULTIPLIER = 1.3
 ROUND_TO_NEAREST_PT = 0.5  # Change to 0.25 for quarter-point rounding
 
 
+_NO_BBOX = {}  # Shared default for lines without a bbox; never mutated
+
+
+def _bbox_top_bottom(line):
+    """Return a line's (top, bottom) with a single bbox lookup; missing values are None."""
+    bbox = line.get("bbox") or _NO_BBOX
+    return bbox.get("top"), bbox.get("bottom")
+
+
+def _line_sort_key(line):
+    """Sort key placing lines by top coordinate, with bbox-less lines last."""
+    top = (line.get("bbox") or _NO_BBOX).get("top")
+    return float("inf") if top is None else top
+
+
+def _is_valid_line(line):
+    """True if a line has text segments, non-blank text and a bbox with positive height."""
+    # Skip lines that are just whitespace or have no segments
+    if not line.get("text_segments") or not line.get("text", "").strip():
+        return False
+    # A missing or empty bbox yields (None, None) and is skipped here too
+    line_top, line_bottom = _bbox_top_bottom(line)
+    return line_top is not None and line_bottom is not None and line_bottom > line_top
+
+
 def round_to_nearest(value, nearest):
     """Round value to the nearest specified increment (e.g., 0.5 or 0.25)."""
     return round(value / nearest) * nearest
 
 
-def identify_header_footer_candidates(page_lines, page_height, analysis_results):
-    """
-    Identifies candidate header and footer boundaries for a single page
-    using iterative spacing analysis.
+def round_all_to_nearest(values, nearest):
+    """Round every value in an iterable to the nearest increment in one pass."""
+    return [round(value / nearest) * nearest for value in values]
 
-    Args:
-        page_lines (list): List of line objects for the page, sorted by top y-coord.
-        page_height (float): The height of the page in points.
-        analysis_results (dict): Dictionary containing overall document analysis
-                                 (e.g., 'most_common_spacing').
+
+def _scan_header_footer(tops, bottoms, header_max_y, footer_min_y, large_gap_threshold, small_gap_threshold, page_height):
+    """Per-page header/footer gap classifier.
+
+    Works only on the coordinate columns and scalar zone/threshold values,
+    with no access to line objects or the analysis results. Gaps are only
+    computed for lines inside each zone, and a zone holding a single line
+    (the common case) needs no gap analysis at all.
 
     Returns:
-        tuple: (candidate_header_bottom_y, candidate_footer_top_y)
-               Returns (None, None) if analysis is not possible.
+        tuple: (header_bottom_y, footer_top_y), unrounded.
     """
-    if not page_lines or not analysis_results or not analysis_results.get("most_common_spacing"):
-        # Check if most_common_spacing exists and has a value
-        if not analysis_results or not analysis_results.get("most_common_spacing"):
-            print("  Warning: Cannot perform header/footer analysis without most_common_spacing.")
-            return None, None
-        # If page_lines is empty but we have spacing, treat as empty page
-        elif not page_lines:
-            return 0, page_height  # Empty page means header ends at 0, footer starts at height
-
-    # --- Define Zones ---
-    header_max_y = HEADER_ZONE_INCHES * POINTS_PER_INCH
-    footer_min_y = page_height - (FOOTER_ZONE_INCHES * POINTS_PER_INCH)
-
-    # --- Get Spacing Thresholds ---
-    # Use most common spacing as the base for thresholds
-    # most_common_spacing is a tuple (value, count)
-    base_spacing = analysis_results["most_common_spacing"][0]
-    large_gap_threshold = base_spacing * LARGE_GAP_MULTIPLIER
-    small_gap_threshold = base_spacing * SMALL_GAP_MULTIPLIER
-    # Note: Ambiguous gaps are between small_gap_threshold and large_gap_threshold
+    line_count = len(tops)
 
     # --- Header Identification ---
-    candidate_header_bottom_y = 0  # Default: header is empty space at top
-    header_block_lines = []
-    last_line_in_header_zone_bottom = 0  # Track bottom of the last line physically in zone
-
-    for i, current_line in enumerate(page_lines):
-        line_top = current_line.get("bbox", {}).get("top")
-        line_bottom = current_line.get("bbox", {}).get("bottom")
-
-        if line_top is None or line_bottom is None:
-            continue  # Skip lines with bad bbox
-
-        # --- Initial Check: Is the first line already below the header zone? ---
-        if i == 0 and line_top >= header_max_y:
-            # No text in header zone, header is empty space above this line
-            candidate_header_bottom_y = 0  # Explicitly set
-            break  # Stop header search
-
-        # Track the bottom-most point of any line starting within the header zone
-        if line_top < header_max_y:
-            last_line_in_header_zone_bottom = max(last_line_in_header_zone_bottom, line_bottom)
-
-        # --- If line starts within header zone, evaluate spacing to next line ---
-        if line_top < header_max_y:
-            header_block_lines.append(current_line)  # Tentatively add to header block
-            current_block_bottom = line_bottom
-
-            # Look at the next line
-            if i + 1 < len(page_lines):
-                next_line = page_lines[i + 1]
-                next_line_top = next_line.get("bbox", {}).get("top")
-                next_line_bottom = next_line.get("bbox", {}).get("bottom")
-
-                if next_line_top is None or next_line_bottom is None:
-                    # Cannot evaluate gap, assume current line ends header for safety
-                    candidate_header_bottom_y = current_block_bottom
-                    break
-
-                gap = next_line_top - current_block_bottom
-
-                if gap < 0:
-                    gap = 0  # Handle minor overlaps gracefully
-
-                # --- Evaluate Gap ---
-                if gap >= large_gap_threshold:
-                    # Large gap found: current block is the header
-                    candidate_header_bottom_y = current_block_bottom
-                    break  # Header found
-
-                elif gap < small_gap_threshold:
-                    # Small gap: next line is part of the same block.
-                    # Continue loop - next_line will be processed.
-                    # If this combined block eventually crosses header_max_y,
-                    # it will be classified as body text starting high.
-                    pass  # Continue iteration
-
-                else:  # Ambiguous (paragraph-like) gap
-                    # Treat as potential header end for now. Cross-page
-                    # analysis will be needed to confirm.
-                    candidate_header_bottom_y = current_block_bottom
-                    # Don't break yet, let next line be evaluated in case it's
-                    # also in the header zone with ambiguous spacing.
-                    # However, if the *next* line is clearly body text (below zone),
-                    # this boundary holds.
-
+    # Lines are sorted by top, so the lines starting inside the header zone
+    # form a prefix of the page.
+    header_count = bisect_left(tops, header_max_y)
+    if header_count == 0:
+        # No text in header zone, header is empty space above the first line
+        candidate_header_bottom_y = 0
+    elif header_count == 1:
+        # A lone line in the zone ends the header whatever gap follows it
+        candidate_header_bottom_y = bottoms[0]
+    else:
+        # header_gaps[i] is the space below line i (minor overlaps count as 0);
+        # the last line on the page has none
+        header_gaps = [max(spacing, 0) for spacing in map(sub, tops[1 : header_count + 1], bottoms[:header_count])]
+        large_gap_idx = next((i for i, gap in enumerate(header_gaps) if gap >= large_gap_threshold), None)
+        if large_gap_idx is not None:
+            # Large gap found: the block ending at this line is the header
+            candidate_header_bottom_y = bottoms[large_gap_idx]
+        elif header_count == line_count:
+            # Every line on the page is in the header zone; the last one ends it
+            candidate_header_bottom_y = bottoms[-1]
+        else:
+            # Ambiguous (paragraph-like) gaps mark potential header ends; the
+            # lowest one wins. Cross-page analysis will be needed to confirm.
+            ambiguous_idx = next(
+                (i for i in reversed(range(len(header_gaps))) if header_gaps[i] >= small_gap_threshold), None
+            )
+            if ambiguous_idx is not None:
+                candidate_header_bottom_y = bottoms[ambiguous_idx]
             else:
-                # This is the last line on the page and it's in the header zone.
-                candidate_header_bottom_y = current_block_bottom
-                break  # End of page
-
-        # --- Line starts below header zone ---
+                # Only small gaps: the header block runs to the bottom-most point
+                # of any line starting within the zone
+                candidate_header_bottom_y = max(bottoms[:header_count])
+
+    # --- Footer Identification (Scan from bottom up) ---
+    # The footer block is the run of trailing lines ending inside the zone.
+    footer_count = next(
+        (i for i, line_bottom in enumerate(reversed(bottoms)) if line_bottom <= footer_min_y),
+        line_count,
+    )
+    footer_start = line_count - footer_count
+    if footer_count == 0:
+        # No text in footer zone, footer is empty space below the last line
+        candidate_footer_top_y = page_height
+    elif footer_count == 1:
+        # A lone line in the zone starts the footer whatever gap precedes it
+        candidate_footer_top_y = tops[-1]
+    else:
+        # footer_gaps[j] is the space above line gap_start + j; the first
+        # line on the page has none
+        gap_start = max(footer_start, 1)
+        footer_gaps = [max(spacing, 0) for spacing in map(sub, tops[gap_start:], bottoms[gap_start - 1 : -1])]
+        large_gap_idx = next(
+            (j for j in reversed(range(len(footer_gaps))) if footer_gaps[j] >= large_gap_threshold), None
+        )
+        if large_gap_idx is not None:
+            # Large gap found: the block starting at this line is the footer
+            candidate_footer_top_y = tops[gap_start + large_gap_idx]
+        elif footer_count == line_count:
+            # Every line on the page is in the footer zone; the first one starts it
+            candidate_footer_top_y = tops[0]
         else:
-            # We've hit the first line that starts *outside* the header zone.
-            # The header ended before this line. The candidate_header_bottom_y
-            # should be the bottom of the last line processed *within* the zone.
-            # Use the tracked 'last_line_in_header_zone_bottom' if no large gap was found earlier.
-            if not header_block_lines:  # No lines were ever added to the block
-                candidate_header_bottom_y = 0
-            elif candidate_header_bottom_y == 0:  # Default wasn't overridden by a gap break
-                candidate_header_bottom_y = last_line_in_header_zone_bottom
-
-            break  # Stop header search
-
-    # --- Footer Identification (Iterate from bottom up) ---
-    candidate_footer_top_y = page_height  # Default: footer is empty space at bottom
-    footer_block_lines = []
-    first_line_in_footer_zone_top = page_height  # Track top of the first line physically in zone
-
-    for i in range(len(page_lines) - 1, -1, -1):  # Iterate backwards
-        current_line = page_lines[i]
-        line_top = current_line.get("bbox", {}).get("top")
-        line_bottom = current_line.get("bbox", {}).get("bottom")
-
-        if line_top is None or line_bottom is None:
-            continue  # Skip lines with bad bbox
-
-        # --- Initial Check: Is the last line already above the footer zone? ---
-        if i == len(page_lines) - 1 and line_bottom <= footer_min_y:
-            # No text in footer zone, footer is empty space below this line
-            candidate_footer_top_y = page_height  # Explicitly set
-            break  # Stop footer search
-
-        # Track the top-most point of any line ending within the footer zone
-        if line_bottom > footer_min_y:
-            first_line_in_footer_zone_top = min(first_line_in_footer_zone_top, line_top)
-
-        # --- If line ends within footer zone, evaluate spacing to previous line ---
-        if line_bottom > footer_min_y:
-            footer_block_lines.append(current_line)  # Tentatively add to footer block
-            current_block_top = line_top
-
-            # Look at the previous line (higher up the page)
-            if i - 1 >= 0:
-                prev_line = page_lines[i - 1]
-                prev_line_top = prev_line.get("bbox", {}).get("top")
-                prev_line_bottom = prev_line.get("bbox", {}).get("bottom")
-
-                if prev_line_top is None or prev_line_bottom is None:
-                    # Cannot evaluate gap, assume current line starts footer
-                    candidate_footer_top_y = current_block_top
-                    break
-
-                gap = current_block_top - prev_line_bottom
-
-                if gap < 0:
-                    gap = 0  # Handle minor overlaps
-
-                # --- Evaluate Gap ---
-                if gap >= large_gap_threshold:
-                    # Large gap found: current block is the footer
-                    candidate_footer_top_y = current_block_top
-                    break  # Footer found
-
-                elif gap < small_gap_threshold:
-                    # Small gap: previous line is part of the same block.
-                    # Continue loop - prev_line will be processed.
-                    pass  # Continue iteration
-
-                else:  # Ambiguous (paragraph-like) gap
-                    # Treat as potential footer start for now.
-                    candidate_footer_top_y = current_block_top
-                    # Continue loop to potentially group more lines.
-
+            # Ambiguous gaps mark potential footer starts; the highest one wins
+            ambiguous_idx = next((j for j, gap in enumerate(footer_gaps) if gap >= small_gap_threshold), None)
+            if ambiguous_idx is not None:
+                candidate_footer_top_y = tops[gap_start + ambiguous_idx]
             else:
-                # This is the first line on the page and it's in the footer zone.
-                candidate_footer_top_y = current_block_top
-                break  # End of page (top reached)
+                # Only small gaps: the footer block starts at the top-most line in the zone
+                candidate_footer_top_y = tops[footer_start]
 
-        # --- Line ends above footer zone ---
-        else:
-            # We've hit the first line (from bottom) that ends *outside* footer zone.
-            # The footer started after this line. candidate_footer_top_y
-            # should be the top of the first line processed *within* the zone.
-            if not footer_block_lines:  # No lines were ever added
-                candidate_footer_top_y = page_height
-            elif candidate_footer_top_y == page_height:  # Default wasn't overridden
-                candidate_footer_top_y = first_line_in_footer_zone_top
+    return candidate_header_bottom_y, candidate_footer_top_y
 
-            break  # Stop footer search
 
-    # Round results for consistency in aggregation
-    if candidate_header_bottom_y is not None:
-        candidate_header_bottom_y = round(candidate_header_bottom_y, 1)
-    if candidate_footer_top_y is not None:
-        candidate_footer_top_y = round(candidate_footer_top_y, 1)
+def identify_header_footer_candidates(tops, bottoms, page_height, large_gap_threshold, small_gap_threshold, header_max_y, footer_min_y):
+    """
+    Identifies candidate header and footer boundaries for a single page
+    using iterative spacing analysis.
 
-    return candidate_header_bottom_y, candidate_footer_top_y
+    The page is described by parallel columns of line coordinates rather than
+    the line objects themselves, so each gap is computed once and the header
+    and footer searches become scans over that gap list. Zones and gap
+    thresholds are document-wide and are computed once by the caller.
+
+    Args:
+        tops (list): Top y-coord of each valid line on the page, sorted ascending.
+        bottoms (list): Bottom y-coord of each line, parallel to ``tops``.
+        page_height (float): The height of the page in points.
+        large_gap_threshold (float): Gaps at or above this end a header/footer block.
+        small_gap_threshold (float): Gaps below this keep lines in the same block.
+            Gaps in between are ambiguous (paragraph-like).
+        header_max_y (float): Lines starting above this y-coord are in the header zone.
+        footer_min_y (float): Lines ending below this y-coord are in the footer zone.
+
+    Returns:
+        tuple: (candidate_header_bottom_y, candidate_footer_top_y)
+    """
+    if not tops:
+        return 0, page_height  # Empty page means header ends at 0, footer starts at height
+
+    candidate_header_bottom_y, candidate_footer_top_y = _scan_header_footer(
+        tops, bottoms, header_max_y, footer_min_y, large_gap_threshold, small_gap_threshold, page_height
+    )
+
+    # Round results for consistency in aggregation
+    return round(candidate_header_bottom_y, 1), round(candidate_footer_top_y, 1)
 
 
 def analyze_document_lines(file_path):
@@ -241,8 +197,15 @@ def analyze_document_lines(file_path):
               header/footer candidates. Returns None if an error occurs.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if orjson is not None:
+            # orjson parses the file's bytes in place through a read-only map,
+            # so neither a decoded str nor a bytes copy of the input is made
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
+        else:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         return None
@@ -256,7 +219,7 @@ def analyze_document_lines(file_path):
     all_fonts = []
     all_sizes = []
     all_spacings = []
-    page_details = []  # Store per-page info including lines and height
+    page_details = []  # Store per-page line coordinates and height
 
     print(f"Analyzing {len(data)} page(s)...")
 
@@ -268,71 +231,52 @@ def analyze_document_lines(file_path):
         lines = page_data.get("lines", [])
 
         # Sort lines by vertical position (top coordinate)
-        lines.sort(key=lambda line: line.get("bbox", {}).get("top", float("inf")))
+        lines.sort(key=_line_sort_key)
 
         print(f"  Processing Page {page_num} with {len(lines)} lines (Pass 1).")
 
-        page_max_bottom = 0
-        previous_line_bottom = None
-        valid_lines_for_page = []  # Store lines with valid bbox for pass 2
-
-        for i, line in enumerate(lines):
-            bbox = line.get("bbox")
-            text_segments = line.get("text_segments", [])
-
-            # --- Basic Validity Check ---
-            # Skip lines that are just whitespace or have no segments/bbox
-            if not text_segments or not bbox or not line.get("text", "").strip():
-                # print(f"    Skipping line {i+1} on page {page_num} due to missing data or empty text.")
-                continue
-
-            line_top = bbox.get("top")
-            line_bottom = bbox.get("bottom")
-
-            if line_top is None or line_bottom is None or line_bottom <= line_top:
-                # print(f"    Skipping line {i+1} on page {page_num} due to invalid bbox: {bbox}")
-                continue
-
-            valid_lines_for_page.append(line)  # Add line for Pass 2 processing
-
-            # Update page height estimate
-            if line_bottom > page_max_bottom:
-                page_max_bottom = line_bottom
-
-            # --- Font and Size Analysis ---
-            first_segment = text_segments[0]
-            font_name = first_segment.get("font", "UnknownFont")
-            font_size = first_segment.get("rounded_size")
-            if font_size is None:
-                font_size = first_segment.get("reported_size")
-
-            if font_size is not None:
-                rounded_font_size = round_to_nearest(font_size, ROUND_TO_NEAREST_PT)
-                all_fonts.append(font_name)
-                all_sizes.append(rounded_font_size)
-
-            # --- Spacing Analysis ---
-            if previous_line_bottom is not None:
-                spacing = line_top - previous_line_bottom
-                # Only consider positive spacing for typical analysis
-                if spacing > 0:
-                    rounded_spacing = round_to_nearest(spacing, ROUND_TO_NEAREST_PT)
-                    all_spacings.append(rounded_spacing)
-                # elif spacing < 0:
-                # print(f"    Warning: Negative spacing ({spacing:.2f}) detected before line {i+1} on page {page_num}.")
-
-            previous_line_bottom = line_bottom  # Update for next valid line
+        # Store lines with valid text and bbox for the per-page columns below
+        valid_lines_for_page = [line for line in lines if _is_valid_line(line)]
+
+        # --- Font and Size Analysis ---
+        # Pull the first segment of each line once, then read the font and
+        # size columns from it instead of looking them up line by line.
+        first_segments = [line["text_segments"][0] for line in valid_lines_for_page]
+        page_fonts = [segment.get("font", "UnknownFont") for segment in first_segments]
+        page_sizes = [segment.get("rounded_size") for segment in first_segments]
+        page_sizes = [
+            segment.get("reported_size") if size is None else size
+            for segment, size in zip(first_segments, page_sizes)
+        ]
+        # Lines without any size information are left out of both tallies
+        all_fonts.extend(font for font, size in zip(page_fonts, page_sizes) if size is not None)
+        all_sizes.extend(size for size in page_sizes if size is not None)
+
+        # --- Spacing Analysis ---
+        # Gap between each valid line and the one before it, computed over
+        # the page's top/bottom columns in one pass rather than per line.
+        tops = [line["bbox"]["top"] for line in valid_lines_for_page]
+        bottoms = [line["bbox"]["bottom"] for line in valid_lines_for_page]
+        # Update page height estimate
+        page_max_bottom = max(bottoms, default=0)
+        # Only consider positive spacing for typical analysis
+        all_spacings.extend(spacing for spacing in map(sub, tops[1:], bottoms[:-1]) if spacing > 0)
 
         page_details.append(
             {
                 "page_num": page_num,
-                "lines": valid_lines_for_page,
+                # Pass 2 only needs the coordinate columns, not the line dicts
+                "tops": tops,
+                "bottoms": bottoms,
                 "estimated_height": page_max_bottom,  # Use max bottom found on page
             }
         )
         if page_max_bottom > max_page_bottom:
             max_page_bottom = page_max_bottom
 
+    # Nothing past Pass 1 references the raw line dicts; release them early
+    del data
+
     # --- Aggregate Initial Results ---
     if not all_fonts or not all_sizes or not all_spacings:
         print("Warning: Insufficient data found to perform basic analysis.")
@@ -351,19 +295,21 @@ def analyze_document_lines(file_path):
         }
     else:
         font_counts = Counter(all_fonts)
-        size_counts = Counter(all_sizes)
-        spacing_counts = Counter(all_spacings)
+        # Sizes and spacings are collected raw and rounded exactly once here
+        size_counts = Counter(round_all_to_nearest(all_sizes, ROUND_TO_NEAREST_PT))
+        spacing_counts = Counter(round_all_to_nearest(all_spacings, ROUND_TO_NEAREST_PT))
         most_common_font = font_counts.most_common(1)[0] if font_counts else None
         most_common_size = size_counts.most_common(1)[0] if size_counts else None
-        # Filter out zero spacing if it's most common but others exist
-        common_spacings = spacing_counts.most_common()
-        most_common_spacing = None
-        for sp, count in common_spacings:
-            if sp > 0.01:  # Use a small threshold to avoid floating point issues
-                most_common_spacing = (sp, count)
-                break
-        if most_common_spacing is None and common_spacings:  # Fallback if only 0 exists
-            most_common_spacing = common_spacings[0]
+        # Filter out zero spacing if it's most common but others exist.
+        # max() keeps the first of equal counts, matching most_common() order,
+        # without sorting the whole distribution.
+        most_common_spacing = max(
+            (item for item in spacing_counts.items() if item[0] > 0.01),  # Small threshold avoids float issues
+            key=itemgetter(1),
+            default=None,
+        )
+        if most_common_spacing is None:  # Fallback if only 0 exists
+            most_common_spacing = spacing_counts.most_common(1)[0]
 
         analysis_results = {
             "font_counts": dict(font_counts),
@@ -385,18 +331,32 @@ def analyze_document_lines(file_path):
     page_height_to_use = analysis_results["overall_estimated_height"]
     print(f"\nUsing estimated page height: {page_height_to_use:.2f} points ({page_height_to_use / POINTS_PER_INCH:.2f} inches)")
 
-    for page_info in analysis_results["page_details"]:
-        page_num = page_info["page_num"]
-        print(f"  Processing Page {page_num} (Pass 2 - Header/Footer).")
-        header_cand, footer_cand = identify_header_footer_candidates(
-            page_info["lines"],
-            page_height_to_use,  # Use consistent height estimate
-            analysis_results,  # Pass common stats
-        )
-        if header_cand is not None:
+    if analysis_results["most_common_spacing"]:
+        # --- Define Zones and Spacing Thresholds (same for every page) ---
+        # All pages share page_height_to_use, so the footer zone is fixed too
+        footer_min_y = page_height_to_use - FOOTER_ZONE_HEIGHT
+        # Use most common spacing as the base for thresholds
+        # most_common_spacing is a tuple (value, count)
+        base_spacing = analysis_results["most_common_spacing"][0]
+        large_gap_threshold = base_spacing * LARGE_GAP_MULTIPLIER
+        small_gap_threshold = base_spacing * SMALL_GAP_MULTIPLIER
+
+        for page_info in analysis_results["page_details"]:
+            page_num = page_info["page_num"]
+            print(f"  Processing Page {page_num} (Pass 2 - Header/Footer).")
+            header_cand, footer_cand = identify_header_footer_candidates(
+                page_info["tops"],
+                page_info["bottoms"],
+                page_height_to_use,  # Use consistent height estimate
+                large_gap_threshold,
+                small_gap_threshold,
+                HEADER_MAX_Y,
+                footer_min_y,
+            )
             all_header_candidates.append(header_cand)
-        if footer_cand is not None:
             all_footer_candidates.append(footer_cand)
+    else:
+        print("  Warning: Cannot perform header/footer analysis without most_common_spacing.")
 
     # --- Aggregate Header/Footer Candidates ---
     if all_header_candidates:
@@ -411,6 +371,22 @@ def analyze_document_lines(file_path):
     return analysis_results
 
 
+def _format_candidate_entry(y_coord, num):
+    """Format one header/footer candidate line; candidates are only rounded to 0.1 pt upstream."""
+    return f"    - {round_to_nearest(y_coord, ROUND_TO_NEAREST_PT):.2f} pt : {num} pages"
+
+
+def _print_top_entries(counter, limit, format_entry):
+    """Print the ``limit`` most common entries of a Counter, followed by "..." if truncated.
+
+    The lines are joined and written in a single call rather than one print per entry.
+    """
+    entries = [format_entry(key, num) for key, num in counter.most_common(limit)]
+    if len(counter) > limit:
+        entries.append("    ...")
+    sys.stdout.write("\n".join(entries) + "\n")
+
+
 def print_analysis(results):
     """Prints the analysis results and conclusions in a readable format."""
     if not results:
@@ -441,11 +417,9 @@ def print_analysis(results):
         sorted_sizes = sorted(results["size_counts"].items(), key=lambda item: item[0])  # Sort by size
         print("  Distribution:")
         for size, count in sorted_sizes:
-            rounded_size = round_to_nearest(size, ROUND_TO_NEAREST_PT)
-            print(f"    - {rounded_size:.2f} pt: {count} lines")
+            print(f"    - {size:.2f} pt: {count} lines")
         if results["most_common_size"]:
-            likely_body_size_val = round_to_nearest(results['most_common_size'][0], ROUND_TO_NEAREST_PT)
-            likely_body_size = f"{likely_body_size_val:.2f} pt"
+            likely_body_size = f"{results['most_common_size'][0]:.2f} pt"
             print(f"\n  Conclusion: Likely body text size is {likely_body_size} ({results['most_common_size'][1]} lines).")
         else:
             print("\n  Conclusion: Could not determine a dominant font size.")
@@ -460,18 +434,11 @@ def print_analysis(results):
     if results["spacing_counts"]:
         spacing_counts = Counter(results["spacing_counts"])  # Ensure it's a Counter
         print("  Spacing Distribution (Top 10 most frequent):")
-        limit = 10
-        count = 0
-        for spacing, num in spacing_counts.most_common():
-            rounded_spacing = round_to_nearest(spacing, ROUND_TO_NEAREST_PT)
-            if count < limit or len(spacing_counts) <= limit:
-                print(f"    - {rounded_spacing:.2f} pt gap: {num} occurrences")
-            elif count == limit:
-                print("    ...")
-            count += 1
+        # Spacing keys are already rounded to ROUND_TO_NEAREST_PT
+        _print_top_entries(spacing_counts, 10, "    - {:.2f} pt gap: {} occurrences".format)
 
         if results["most_common_spacing"]:
-            common_spacing_val = round_to_nearest(results["most_common_spacing"][0], ROUND_TO_NEAREST_PT)
+            common_spacing_val = results["most_common_spacing"][0]
             likely_line_spacing = f"{common_spacing_val:.2f} pt"
             print(f"\n  Conclusion: Likely standard line spacing (within paragraphs) is {likely_line_spacing} ({results['most_common_spacing'][1]} occurrences).")
 
@@ -480,9 +447,8 @@ def print_analysis(results):
             potential_para_gaps = {k: v for k, v in spacing_counts.items() if k > common_spacing_val * para_gap_multiplier and k < common_spacing_val * LARGE_GAP_MULTIPLIER * 1.5}
             if potential_para_gaps:
                 sorted_para_gaps = sorted(potential_para_gaps.items(), key=lambda item: item[1], reverse=True)
-                likely_para_spacing_val = round_to_nearest(sorted_para_gaps[0][0], ROUND_TO_NEAREST_PT)
-                likely_para_spacing = f"{likely_para_spacing_val:.2f} pt"
-                potential_para_gaps_found = [f"{round_to_nearest(g, ROUND_TO_NEAREST_PT):.2f} pt ({n} times)" for g, n in sorted_para_gaps[:3]]
+                likely_para_spacing = f"{sorted_para_gaps[0][0]:.2f} pt"
+                potential_para_gaps_found = [f"{g:.2f} pt ({n} times)" for g, n in sorted_para_gaps[:3]]
                 print(f"  Conclusion: Likely paragraph spacing is around {likely_para_spacing} (found {sorted_para_gaps[0][1]} times).")
                 print(f"              Other potential paragraph/section gaps: {', '.join(potential_para_gaps_found[1:])}")
 
@@ -503,15 +469,7 @@ def print_analysis(results):
         header_counter = Counter(results["header_candidates"])
         if header_counter:
             print("  Supporting Evidence (Candidate Y coords and page counts, Top 5):")
-            limit = 5
-            count = 0
-            for y_coord, num in header_counter.most_common():
-                rounded_y = round_to_nearest(y_coord, ROUND_TO_NEAREST_PT)
-                if count < limit or len(header_counter) <= limit:
-                    print(f"    - {rounded_y:.2f} pt : {num} pages")
-                elif count == limit:
-                    print("    ...")
-                count += 1
+            _print_top_entries(header_counter, 5, _format_candidate_entry)
         else:
             print("  No consistent header candidates found across pages.")
     else:
@@ -529,15 +487,7 @@ def print_analysis(results):
         footer_counter = Counter(results["footer_candidates"])
         if footer_counter:
             print("  Supporting Evidence (Candidate Y coords and page counts, Top 5):")
-            limit = 5
-            count = 0
-            for y_coord, num in footer_counter.most_common():
-                rounded_y = round_to_nearest(y_coord, ROUND_TO_NEAREST_PT)
-                if count < limit or len(footer_counter) <= limit:
-                    print(f"    - {rounded_y:.2f} pt : {num} pages")
-                elif count == limit:
-                    print("    ...")
-                count += 1
+            _print_top_entries(footer_counter, 5, _format_candidate_entry)
         else:
             print("  No consistent footer candidates found across pages.")
     else:
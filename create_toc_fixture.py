@@ -4,6 +4,11 @@
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serializer
+    orjson = None
+
 def create_toc_fixture():
     """Extract pages 5-10 from H.264 100 pages data to create TOC fixture."""
 
@@ -19,12 +24,11 @@ def create_toc_fixture():
 
     # Extract pages 5-10 (contains TOC starting on page 6)
     pages_to_extract = [5, 6, 7, 8, 9, 10]
-    extracted_pages = []
+    wanted_pages = frozenset(pages_to_extract)
+    extracted_pages = [page_data for page_data in source_data['pages'] if page_data['page'] in wanted_pages]
 
-    for page_data in source_data['pages']:
-        if page_data['page'] in pages_to_extract:
-            extracted_pages.append(page_data)
-            print(f"Extracted page {page_data['page']}")
+    for page_data in extracted_pages:
+        print(f"Extracted page {page_data['page']}")
 
     if len(extracted_pages) != 6:
         print(f"Warning: Expected 6 pages, got {len(extracted_pages)}")
@@ -56,8 +60,11 @@ def create_toc_fixture():
     output_file = Path("tests/fixtures/test_document_with_toc.json")
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, 'w') as f:
-        json.dump(fixture_data, f, indent=2)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(fixture_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(fixture_data, f, indent=2)
 
     print(f"✅ Created TOC fixture: {output_file}")
     print(f"📊 Contains {len(extracted_pages)} pages: {pages_to_extract}")
@@ -21,38 +21,42 @@ with pdfplumber.open(args.filename) as pdf:
     for page_number, page in enumerate(pdf.pages, start=1):
         # Print page divider
         print(f"------------- Page {page_number} -----------------")
+
+        # Extract characters once per page; page.chars is invariant across lines
+        chars = page.chars
+
+        # Bucket characters into 10pt bands by top coordinate in a single pass,
+        # so each line looks up its band instead of rescanning every character.
+        # Each character is classified here, once, into its (font, size) key, text
+        # and whether that text is whitespace.
+        chars_by_band = defaultdict(list)
+        for char in chars:
+            font_size_key = (char.get('fontname', 'Unknown'), round(char['size'], 1))
+            text = char['text']
+            chars_by_band[int(char['top'] // 10)].append((font_size_key, text, text.isspace()))
         
         # Extract text lines
         lines = page.extract_text().split('\n')
         
         # Iterate through each line
         for line_number, line in enumerate(lines, start=1):
-            # Extract characters for the line
-            chars = page.chars
-            
-            # Filter characters that belong to the current line
-            line_chars = [char for char in chars if char['top'] >= line_number * 10 and char['top'] < (line_number + 1) * 10]
+            # Characters that belong to the current line
+            line_chars = chars_by_band.get(line_number, ())
             
-            # Initialize current font-size and text
+            # Initialize current font-size and text; the text is collected as
+            # a list of pieces and joined once per segment
             current_font_size = None
-            current_text = ""
+            current_buf = []
             line_font_sizes = set()
 
             # Print line number
             print(f"Line {line_number}:")
             
             # Iterate through characters in the line
-            for char in line_chars:
-                font_size = round(char['size'], 1)
-                font_name = char.get('fontname', 'Unknown')
-                font_size_key = (font_name, font_size)
-                text = char['text']
-                
-                # Determine if the text is whitespace
-                is_whitespace = text.isspace()
-                
+            for font_size_key, text, is_whitespace in line_chars:
                 # Check if the font-size has changed, ignoring whitespace
                 if font_size_key != current_font_size and not is_whitespace:
+                    current_text = "".join(current_buf)
                     # Print the current text if it's not empty and current_font_size is not None
                     if current_text and current_font_size is not None:
                         display_text = current_text.strip() if current_text.strip() else "<<blank>>"
@@ -64,12 +68,13 @@ with pdfplumber.open(args.filename) as pdf:
                     
                     # Update the current font-size and text
                     current_font_size = font_size_key
-                    current_text = text
+                    current_buf = [text]
                 else:
                     # Add the text to the current text
-                    current_text += text
+                    current_buf.append(text)
             
             # Print the last text block in the line if current_font_size is not None
+            current_text = "".join(current_buf)
             if current_text and current_font_size is not None:
                 display_text = current_text.strip() if current_text.strip() else "<<blank>>"
                 # Determine if the line is a single font-size line
@@ -5,9 +5,112 @@ import json
 import pdfplumber
 import os
 import sys  # Import sys to exit gracefully on error
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serializer
+    orjson = None
 
-def extract_text_from_pdf(pdf_path, start_page=None, stop_page=None):
+
+BACKENDS = ("pdfplumber", "pymupdf")
+
+
+def text_to_lines(text):
+    """
+    Splits a page's extracted text into numbered, non-empty line dictionaries.
+
+    Args:
+        text (str): The page text, lines separated by newlines. May be empty or None.
+
+    Returns:
+        list: Line dictionaries with a 1-based line number and stripped text.
+    """
+    page_lines = []
+    if text:
+        # Split text into lines based on newline characters
+        lines = text.split("\n")
+        for line_num, line_text in enumerate(lines):
+            # Only add non-empty lines
+            if line_text.strip():
+                page_lines.append(
+                    {"line_number": line_num + 1, "text": line_text.strip()}
+                )
+    return page_lines
+
+
+def to_json_bytes(data):
+    """
+    Serializes extracted data as UTF-8, 2-space indented JSON.
+
+    Args:
+        data: The JSON-serializable data to encode.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def extract_page_lines(page):
+    """
+    Extracts the non-empty text lines of a single page.
+
+    Args:
+        page (pdfplumber.page.Page): The page to extract.
+
+    Returns:
+        dict: The page number (1-based) and a list of line dictionaries.
+    """
+    # Extract text, preserving layout to some extent
+    text = page.extract_text(x_tolerance=3, y_tolerance=3)
+    return {"page_number": page.page_number, "lines": text_to_lines(text)}
+
+
+def extract_pages_pymupdf(pdf_path, start_page, stop_page):
+    """
+    Extracts the text lines of a page range using PyMuPDF.
+
+    PyMuPDF's C text extractor is much faster than pdfminer, but it groups
+    text by its own block rules, so line breaks can differ from pdfplumber's.
+
+    Args:
+        pdf_path (str): The path to the input PDF file.
+        start_page (int): The first page number to process (1-based).
+        stop_page (int): The last page number to process (1-based, inclusive).
+
+    Returns:
+        list: One page dictionary per page, in the same format as extract_page_lines.
+    """
+    import pymupdf  # Imported lazily; only needed for this backend
+
+    with pymupdf.open(pdf_path) as doc:
+        return [
+            {"page_number": i + 1, "lines": text_to_lines(doc.load_page(i).get_text("text"))}
+            for i in range(start_page - 1, stop_page)
+        ]
+
+
+def extract_page_chunk(pdf_path, page_numbers):
+    """
+    Worker entry point: opens the PDF once and extracts a contiguous chunk of pages.
+
+    Args:
+        pdf_path (str): The path to the input PDF file.
+        page_numbers (list): 1-based page numbers to extract, in order.
+
+    Returns:
+        list: One page dictionary per requested page, in order.
+    """
+    # Only the requested pages are loaded by pdfplumber
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        return [extract_page_lines(page) for page in pdf.pages]
+
+
+def extract_text_from_pdf(pdf_path, start_page=None, stop_page=None, workers=1, backend="pdfplumber"):
     """
     Extracts text from a PDF file, page by page, line by line, within an
     optional page range.
@@ -18,6 +121,13 @@ def extract_text_from_pdf(pdf_path, start_page=None, stop_page=None):
                                      Defaults to None (start from page 1).
         stop_page (int, optional): The last page number to process (1-based, inclusive).
                                     Defaults to None (process until the last page).
+        workers (int, optional): Number of worker processes. With more than one,
+                                 the page range is split into contiguous chunks,
+                                 each extracted by its own process. Defaults to 1
+                                 (serial extraction in this process). Only used
+                                 by the pdfplumber backend.
+        backend (str, optional): Text extraction backend, "pdfplumber" or
+                                 "pymupdf". Defaults to "pdfplumber".
 
     Returns:
         list: A list of dictionaries, where each dictionary represents a page
@@ -71,26 +181,22 @@ def extract_text_from_pdf(pdf_path, start_page=None, stop_page=None):
                 f"(out of {total_pages} total) from {pdf_path}..."
             )
 
-            # Iterate through the specified page range (0-based index for list access)
-            for i in range(actual_start_page - 1, actual_stop_page):
-                page = pdf.pages[i]
-                page_number = i + 1  # 1-based page number for output
-
-                # Extract text, preserving layout to some extent
-                text = page.extract_text(x_tolerance=3, y_tolerance=3)
-
-                page_lines = []
-                if text:
-                    # Split text into lines based on newline characters
-                    lines = text.split("\n")
-                    for line_num, line_text in enumerate(lines):
-                        # Only add non-empty lines
-                        if line_text.strip():
-                            page_lines.append(
-                                {"line_number": line_num + 1, "text": line_text.strip()}
-                            )
-
-                all_pages_data.append({"page_number": page_number, "lines": page_lines})
+            if backend == "pymupdf":
+                all_pages_data = extract_pages_pymupdf(pdf_path, actual_start_page, actual_stop_page)
+            elif workers > 1:
+                # pdfminer parsing is CPU-bound and single-threaded, so pages are
+                # split into one contiguous chunk per worker process. Each worker
+                # opens the PDF once; map() returns the chunks in page order.
+                page_numbers = list(range(actual_start_page, actual_stop_page + 1))
+                chunk_size = max(1, -(-len(page_numbers) // workers))  # Ceiling division
+                chunks = [page_numbers[i : i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+                with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                    for chunk_data in executor.map(extract_page_chunk, repeat(pdf_path), chunks):
+                        all_pages_data.extend(chunk_data)
+            else:
+                # Iterate through the specified page range (0-based index for list access)
+                for i in range(actual_start_page - 1, actual_stop_page):
+                    all_pages_data.append(extract_page_lines(pdf.pages[i]))
 
             print("Extraction complete.")
             return all_pages_data
@@ -128,21 +234,40 @@ def main():
         help="The last page number to process (1-based index, inclusive). Processes until the last page if not set.",
         default=None,  # Default is handled within the extraction function logic
     )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="Number of worker processes used to extract pages in parallel (1 = serial).",
+        default=1,
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=BACKENDS,
+        help="Text extraction backend. pymupdf is much faster; pdfplumber matches the other tools' line grouping.",
+        default="pdfplumber",
+    )
 
     args = parser.parse_args()
 
     extracted_data = extract_text_from_pdf(
-        args.input_pdf, start_page=args.start_page, stop_page=args.stop_page
+        args.input_pdf,
+        start_page=args.start_page,
+        stop_page=args.stop_page,
+        workers=args.workers,
+        backend=args.backend,
     )
 
     if extracted_data is None:
         sys.exit(1)  # Exit with an error code if extraction failed
 
     if extracted_data:
+        output_bytes = to_json_bytes(extracted_data)
         if args.output:
             try:
-                with open(args.output, "w", encoding="utf-8") as f:
-                    json.dump(extracted_data, f, indent=4, ensure_ascii=False)
+                with open(args.output, "wb") as f:
+                    f.write(output_bytes)
                 print(f"Successfully wrote extracted text to {args.output}")
             except IOError as e:
                 print(
@@ -150,9 +275,10 @@ def main():
                 )
                 sys.exit(1)  # Exit with an error code
         else:
-            # Print to standard output if no output file is specified
-            # Use ensure_ascii=False for broader character support
-            print(json.dumps(extracted_data, indent=4, ensure_ascii=False))
+            # Print to standard output if no output file is specified,
+            # after any progress messages already buffered as text
+            sys.stdout.flush()
+            sys.stdout.buffer.write(output_bytes + b"\n")
 
 
 if __name__ == "__main__":
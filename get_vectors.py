@@ -1,26 +1,241 @@
 import argparse
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from operator import itemgetter
 import pdfplumber
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serializer
+    orjson = None
 
-def make_json_serializable(obj):
+
+class LaxEncoder(json.JSONEncoder):
+    """
+    JSON encoder that falls back to str() for non-serializable objects
+    (like PSLiteral). Only those objects reach default(); everything else
+    stays on the C encoder's fast path. Used when orjson is unavailable.
+    """
+
+    def default(self, o):
+        return str(o)
+
+
+def encode_elements(elements):
+    """
+    Encode elements as UTF-8 JSON array items, indented to match a 2-space
+    indented dump of the whole list.
+
+    Non-serializable values (like PSLiteral) are written as str().
+    """
+    if orjson is not None:
+        encoded = [orjson.dumps(element, default=str, option=orjson.OPT_INDENT_2) for element in elements]
+    else:
+        encoder = LaxEncoder(indent=2, ensure_ascii=False)
+        encoded = [encoder.encode(element).encode("utf-8") for element in elements]
+    # JSON strings never contain a raw newline, so every newline is a line break
+    return [b"  " + item.replace(b"\n", b"\n  ") for item in encoded]
+
+
+# Every pdfplumber layout object carries these, so fetch them in one C-level call
+bbox_fields = itemgetter("x0", "top", "x1", "bottom")
+
+
+def extract_page_elements(page, page_num, include_annotations=False, include_edges=False, include_shapes=True):
+    """
+    Collect the non-text elements (images, annotations, hyperlinks, vector
+    shapes and optionally edges) of a single page.
+
+    Each kind of object is only read from the page when it is requested.
+    """
+    elements = []
+
+    # Process images
+    for img in page.images:
+        x0, top, x1, bottom = bbox_fields(img)
+        elements.append(
+            {
+                "type": "image",
+                "page": page_num,
+                "bbox": {"x0": x0, "y0": top, "x1": x1, "y1": bottom},
+                "width": img.get("width", None),
+                "height": img.get("height", None),
+                "metadata": {"name": img.get("name", None), "colorspace": img.get("colorspace", None), "bits": img.get("bits", None), "imagemask": img.get("imagemask", None)},
+            }
+        )
+
+    # Process annotations (optional)
+    if include_annotations:
+        for annot in page.annots:
+            subtype = str(annot.get("subtype", "") or "")
+            content = str(annot.get("content", "") or "")
+            title = str(annot.get("title", "") or "")
+            subject = str(annot.get("subject", "") or "")
+
+            # Skip annotations with no meaningful data
+            if not any([subtype.strip(), content.strip(), title.strip(), subject.strip()]):
+                continue
+
+            x0, top, x1, bottom = bbox_fields(annot)
+            elements.append(
+                {
+                    "type": "annotation",
+                    "subtype": subtype,
+                    "page": page_num,
+                    "bbox": {"x0": x0, "y0": top, "x1": x1, "y1": bottom},
+                    "content": content,
+                    "metadata": {"title": title, "subject": subject},
+                }
+            )
+
+    # Process hyperlinks (always included)
+    for link in page.hyperlinks:
+        x0, top, x1, bottom = bbox_fields(link)
+        elements.append({"type": "hyperlink", "page": page_num, "uri": link["uri"], "bbox": {"x0": x0, "y0": top, "x1": x1, "y1": bottom}})
+
+    # Process vector shapes (lines, curves, rects)
+    for obj_type in ["lines", "curves", "rects"] if include_shapes else []:
+        element_type = obj_type[:-1]  # Singularize
+        for obj in getattr(page, obj_type, []):
+            x0, top, x1, bottom = bbox_fields(obj)
+            elements.append(
+                {
+                    "type": element_type,
+                    "page": page_num,
+                    "bbox": {"x0": x0, "y0": top, "x1": x1, "y1": bottom},
+                    "metadata": {"linewidth": obj.get("linewidth", None), "stroke": obj.get("stroke", None), "fill": obj.get("fill", None)},
+                }
+            )
+
+    # Process edges (optional)
+    if include_edges:
+        for edge in page.edges:
+            x0, top, x1, bottom = bbox_fields(edge)
+            elements.append(
+                {
+                    "type": "edge",
+                    "page": page_num,
+                    "bbox": {"x0": x0, "y0": top, "x1": x1, "y1": bottom},
+                    "metadata": {
+                        "linewidth": edge.get("linewidth", None),
+                        "stroke": edge.get("stroke", None),
+                        "fill": edge.get("fill", None),
+                        "source": edge.get("object_type", "unknown"),
+                    },
+                }
+            )
+
+    return elements
+
+
+def sort_by_y0(elements):
+    """
+    Order a page's elements top to bottom by their bbox y0.
+
+    The y0 keys are pulled out once into a flat list and sorted as indices,
+    so the sort compares plain floats; a missing y0 sorts as 0.0.
+    """
+    ys = [element["bbox"]["y0"] or 0.0 for element in elements]
+    return [elements[i] for i in sorted(range(len(ys)), key=ys.__getitem__)]
+
+
+def extract_page_chunk(pdf_path, page_numbers, include_annotations=False, include_edges=False, include_shapes=True):
     """
-    Recursively convert non-serializable objects (like PSLiteral) to strings.
+    Worker entry point: open the PDF once and collect the elements of a
+    contiguous chunk of pages, each page sorted by y0.
+
+    Elements are returned already encoded, since raw pdfminer objects may
+    not survive the trip back from the worker process.
+    """
+    elements = []
+    # Only the requested pages are loaded by pdfplumber
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            elements.extend(
+                sort_by_y0(extract_page_elements(page, page.page_number, include_annotations, include_edges, include_shapes))
+            )
+    return encode_elements(elements)
+
+
+def resolve_page_range(start_page, stop_page, total_pages):
+    """
+    Validate an optional 1-based, inclusive page range against the document.
+
+    Returns (start_page, stop_page) with defaults filled in, or None after
+    printing an error if the range is invalid.
     """
-    if isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_json_serializable(v) for v in obj]
-    elif isinstance(obj, tuple):
-        return tuple(make_json_serializable(v) for v in obj)
-    elif hasattr(obj, "__dict__"):
-        return str(obj)
-    elif not isinstance(obj, (str, int, float, bool, type(None))):
-        return str(obj)
+    actual_start_page = 1
+    actual_stop_page = total_pages
+
+    if start_page is not None:
+        if 1 <= start_page <= total_pages:
+            actual_start_page = start_page
+        else:
+            print(
+                f"Error: --start-page ({start_page}) is outside the valid range "
+                f"(1 to {total_pages}).",
+                file=sys.stderr,
+            )
+            return None
+
+    if stop_page is not None:
+        if actual_start_page <= stop_page <= total_pages:
+            actual_stop_page = stop_page
+        elif stop_page < actual_start_page:
+            print(
+                f"Error: --stop-page ({stop_page}) cannot be less than "
+                f"--start-page ({actual_start_page}).",
+                file=sys.stderr,
+            )
+            return None
+        else:  # stop_page > total_pages
+            print(
+                f"Error: --stop-page ({stop_page}) is outside the valid range "
+                f"(up to {total_pages}).",
+                file=sys.stderr,
+            )
+            return None
+
+    return actual_start_page, actual_stop_page
+
+
+def iter_page_elements(
+    pdf, pdf_path, start_page, stop_page, include_annotations=False, include_edges=False, include_shapes=True, workers=1
+):
+    """
+    Yield (pages_done, encoded_elements) batches in page order for the
+    1-based, inclusive page range start_page..stop_page.
+
+    Each batch's elements are JSON-encoded and sorted by y0 within each
+    page, so they can be written out as soon as they are produced.
+    """
+    if workers > 1:
+        # Split pages into one contiguous chunk per worker; each worker
+        # opens the PDF with only its own pages and map() returns the
+        # chunks in page order
+        page_numbers = list(range(start_page, stop_page + 1))
+        chunk_size = max(1, -(-len(page_numbers) // workers))  # Ceiling division
+        chunks = [page_numbers[i : i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            chunk_results = executor.map(
+                extract_page_chunk,
+                repeat(pdf_path),
+                chunks,
+                repeat(include_annotations),
+                repeat(include_edges),
+                repeat(include_shapes),
+            )
+            for chunk, elements in zip(chunks, chunk_results):
+                yield len(chunk), elements
     else:
-        return obj
+        # Page contents are parsed lazily, so only the requested pages are parsed
+        for page in pdf.pages[start_page - 1 : stop_page]:
+            elements = extract_page_elements(page, page.page_number, include_annotations, include_edges, include_shapes)
+            yield 1, encode_elements(sort_by_y0(elements))
 
 
 def main():
@@ -29,94 +244,36 @@ def main():
     parser.add_argument("--output", "-o", default="-", help="Output file path (default: stdout)")
     parser.add_argument("--edges", action="store_true", help="Include edge decomposition (rect_edges, curve_edges, lines)")
     parser.add_argument("--annotations", action="store_true", help="Include PDF annotations")
+    parser.add_argument("--no-shapes", action="store_true", help="Skip vector shapes (lines, curves, rects)")
+    parser.add_argument("--start-page", "-s", type=int, default=None, help="First page to process (1-based, default: 1)")
+    parser.add_argument("--stop-page", "-e", type=int, default=None, help="Last page to process (1-based, inclusive, default: last page)")
+    parser.add_argument("--workers", "-j", type=int, default=1, help="Worker processes used to extract pages in parallel (default: 1, serial)")
     args = parser.parse_args()
 
-    results = []
-
     with pdfplumber.open(args.input) as pdf:
-        total_pages = len(pdf.pages)
-        with tqdm(total=total_pages, desc="Processing Pages", unit="page") as pbar:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                # Process images
-                for img in page.images:
-                    results.append(
-                        {
-                            "type": "image",
-                            "page": page_num,
-                            "bbox": {"x0": img.get("x0"), "y0": img.get("top"), "x1": img.get("x1"), "y1": img.get("bottom")},
-                            "width": img.get("width", None),
-                            "height": img.get("height", None),
-                            "metadata": {"name": img.get("name", None), "colorspace": img.get("colorspace", None), "bits": img.get("bits", None), "imagemask": img.get("imagemask", None)},
-                        }
-                    )
-
-                # Process annotations (optional)
-                if args.annotations:
-                    for annot in page.annots:
-                        subtype = str(annot.get("subtype", "") or "")
-                        content = str(annot.get("content", "") or "")
-                        title = str(annot.get("title", "") or "")
-                        subject = str(annot.get("subject", "") or "")
-
-                        # Skip annotations with no meaningful data
-                        if not any([subtype.strip(), content.strip(), title.strip(), subject.strip()]):
-                            continue
-
-                        results.append(
-                            {
-                                "type": "annotation",
-                                "subtype": subtype,
-                                "page": page_num,
-                                "bbox": {"x0": annot.get("x0"), "y0": annot.get("top"), "x1": annot.get("x1"), "y1": annot.get("bottom")},
-                                "content": content,
-                                "metadata": {"title": title, "subject": subject},
-                            }
-                        )
-
-                # Process hyperlinks (always included)
-                for link in page.hyperlinks:
-                    results.append({"type": "hyperlink", "page": page_num, "uri": link["uri"], "bbox": {"x0": link["x0"], "y0": link["top"], "x1": link["x1"], "y1": link["bottom"]}})
-
-                # Process vector shapes (lines, curves, rects)
-                for obj_type in ["lines", "curves", "rects"]:
-                    for obj in getattr(page, obj_type, []):
-                        results.append(
-                            {
-                                "type": obj_type[:-1],  # Singularize
-                                "page": page_num,
-                                "bbox": {"x0": obj.get("x0"), "y0": obj.get("top"), "x1": obj.get("x1"), "y1": obj.get("bottom")},
-                                "metadata": {"linewidth": obj.get("linewidth", None), "stroke": obj.get("stroke", None), "fill": obj.get("fill", None)},
-                            }
-                        )
-
-                # Process edges (optional)
-                if args.edges:
-                    for edge in page.edges:
-                        results.append(
-                            {
-                                "type": "edge",
-                                "page": page_num,
-                                "bbox": {"x0": edge.get("x0"), "y0": edge.get("top"), "x1": edge.get("x1"), "y1": edge.get("bottom")},
-                                "metadata": {
-                                    "linewidth": edge.get("linewidth", None),
-                                    "stroke": edge.get("stroke", None),
-                                    "fill": edge.get("fill", None),
-                                    "source": edge.get("object_type", "unknown"),
-                                },
-                            }
-                        )
-
-                pbar.update(1)
-
-        sorted_results = sorted(results, key=lambda x: x["bbox"]["y0"])
-        serializable_results = make_json_serializable(sorted_results)
+        page_range = resolve_page_range(args.start_page, args.stop_page, len(pdf.pages))
+        if page_range is None:
+            sys.exit(1)
+        start_page, stop_page = page_range
 
         # Output handling
-        if args.output == "-":
-            json.dump(serializable_results, sys.stdout, indent=4)
-        else:
-            with open(args.output, "w") as f:
-                json.dump(serializable_results, f, indent=4)
+        output = nullcontext(sys.stdout.buffer) if args.output == "-" else open(args.output, "wb")
+
+        with output as out, tqdm(total=stop_page - start_page + 1, desc="Processing Pages", unit="page") as pbar:
+            # Stream a 2-space indented JSON array,
+            # writing each page's elements as soon as they are extracted
+            # instead of holding every element of the document in memory
+            written = 0
+            out.write(b"[")
+            for pages_done, elements in iter_page_elements(
+                pdf, args.input, start_page, stop_page, args.annotations, args.edges, not args.no_shapes, args.workers
+            ):
+                for element in elements:
+                    out.write(b",\n" if written else b"\n")
+                    out.write(element)
+                    written += 1
+                pbar.update(pages_done)
+            out.write(b"\n]" if written else b"]")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,524 @@
 import argparse
+import hashlib
 import json
 import pdfplumber
+import pickle
+from pathlib import Path
 from typing import Dict, List
-import re
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, nullcontext
+from functools import lru_cache
+from itertools import chain, repeat, zip_longest
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serializer
+    orjson = None
+
+
+# Per-page extraction results are cached under <CACHE_ROOT>/<sha1 of PDF>/plumb3/
+CACHE_ROOT = Path.home() / ".cache" / "pdf_plumber_util"
+
+# Text extraction backends
+BACKENDS = ("pdfplumber", "pymupdf")
+
+# Extraction methods, by --method name, and the results list each one fills
+METHODS = ("text", "lines", "words")
+METHOD_RESULTS = {"text": "extract_text", "lines": "extract_text_lines", "words": "extract_words_manual"}
+
+# List of required attributes for word sorting
+EXTRA_ATTRS = ["x0", "y0", "x1", "y1", "text", "fontname", "size", "top", "adv"]
+
+# Sort keys for grouping words into lines
+word_top = itemgetter("top")
+word_x0 = itemgetter("x0")
+
+# A word's bounding box coordinates
+word_bbox = itemgetter("x0", "top", "x1", "bottom")
+
+# Font attributes that split a line into text segments (both backends set all three)
+segment_key = itemgetter("fontname", "size", "upright")
+
+
+def pdf_cache_dir(pdf_path: str, backend: str = "pdfplumber") -> Path:
+    """Return the cache directory for a PDF and backend, keyed by the SHA-1 of the PDF's contents."""
+    with open(pdf_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha1").hexdigest()
+    return CACHE_ROOT / digest / ("plumb3" if backend == "pdfplumber" else f"plumb3-{backend}")
+
+
+def extract_page_data(page, methods=METHODS) -> Dict:
+    """
+    Run the pdfplumber extraction of each requested method for a page
+    (independent of the grouping tolerances), keyed by method name.
+
+    The page's chars are parsed once, on first access, and cached on the
+    page, so the methods share them rather than each re-walking pdfminer's
+    layout.
+    """
+    if not page.chars:
+        # Blank or image-only page: skip the extractors, which would find nothing
+        empty = {"text": "", "lines": [], "words": []}
+        return {method: empty[method] for method in methods}
+
+    page_data = {}
+    if "text" in methods:
+        page_data["text"] = page.extract_text()
+    if "lines" in methods:
+        # Only the line text is used, so skip collecting each line's chars
+        text_lines = page.extract_text_lines(layout=True, return_chars=False)
+        page_data["lines"] = [line["text"] for line in text_lines] if text_lines else []
+    if "words" in methods:
+        page_data["words"] = page.extract_words(
+            x_tolerance_ratio=0.3,
+            use_text_flow=True,
+            keep_blank_chars=True,
+            extra_attrs=EXTRA_ATTRS
+        )
+    return page_data
+
+
+def extract_page_data_pymupdf(page, methods=METHODS) -> Dict:
+    """
+    PyMuPDF counterpart of extract_page_data for a pymupdf page.
+
+    Words are per character, like pdfplumber's extract_words with these
+    extra_attrs, but carry only the keys the grouping reads. MuPDF's C
+    extractor is much faster than pdfminer, but its line breaks and font
+    names (no subset prefix) can differ from pdfplumber's.
+    """
+    import pymupdf  # Already imported by iter_backend_pages
+
+    page_data = {}
+    need_rawdict = "lines" in methods or "words" in methods
+    # Each get_text() call runs MuPDF's text extraction again unless it is
+    # handed a TextPage. rawdict's flags only add image blocks, which the
+    # plain-text output skips, so a single TextPage can serve both outputs.
+    textpage = page.get_textpage(flags=pymupdf.TEXTFLAGS_RAWDICT) if need_rawdict else None
+    if "text" in methods:
+        page_data["text"] = page.get_text("text", textpage=textpage).rstrip("\n")
+    if not need_rawdict:
+        return page_data
+
+    text_lines = []
+    words = []
+    for block in page.get_text("rawdict", textpage=textpage)["blocks"]:
+        if block["type"] != 0:  # Image block
+            continue
+        for line in block["lines"]:
+            upright = line["dir"] == (1.0, 0.0)
+            line_text = []
+            for span in line["spans"]:
+                fontname, size = span["font"], span["size"]
+                for char in span["chars"]:
+                    line_text.append(char["c"])
+                    x0, top, x1, bottom = char["bbox"]
+                    words.append(
+                        {
+                            "text": char["c"],
+                            "x0": x0,
+                            "x1": x1,
+                            "top": top,
+                            "bottom": bottom,
+                            "upright": upright,
+                            "fontname": fontname,
+                            "size": size,
+                        }
+                    )
+            line_text = "".join(line_text).strip()
+            if line_text:
+                text_lines.append(line_text)
+
+    if "lines" in methods:
+        page_data["lines"] = text_lines
+    if "words" in methods:
+        page_data["words"] = words
+    return page_data
+
+
+EXTRACTORS = {"pdfplumber": extract_page_data, "pymupdf": extract_page_data_pymupdf}
+
+
+def iter_backend_pages(pdf_path: str, page_numbers: List[int], backend: str = "pdfplumber"):
+    """Yield (page_number, width, height, page) for contiguous 1-based page numbers, with page a backend page object."""
+    if not page_numbers:
+        return  # E.g. a PDF without pages; there is nothing to open
+    if backend == "pymupdf":
+        import pymupdf  # Imported lazily; only needed for this backend
+
+        with pymupdf.open(pdf_path) as doc:
+            for page_number in page_numbers:
+                page = doc.load_page(page_number - 1)
+                yield page_number, page.rect.width, page.rect.height, page
+    else:
+        # Slice the full page list rather than passing pages=, which would
+        # change each word's doctop (its offset within the whole document).
+        # Page contents are parsed lazily, so only these pages are parsed.
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages[page_numbers[0] - 1 : page_numbers[-1]]:
+                yield page.page_number, page.width, page.height, page
+
+
+def load_page_data(
+    page,
+    page_number: int,
+    cache_dir: Path = None,
+    force_refresh: bool = False,
+    methods=METHODS,
+    backend: str = "pdfplumber",
+) -> Dict:
+    """
+    Return the backend's extraction of page, reading it from cache_dir when present.
+
+    Without a cache_dir the page is always extracted. With force_refresh the
+    cached entry is ignored and rewritten. Methods missing from a cached
+    entry are extracted and added to it.
+    """
+    extract = EXTRACTORS[backend]
+    if cache_dir is None:
+        return extract(page, methods)
+
+    cache_path = cache_dir / f"page_{page_number}.pkl"
+    page_data = {}
+    if not force_refresh:
+        try:
+            with open(cache_path, "rb") as f:
+                page_data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass  # Missing or unreadable entry; extract it again
+
+    missing = [method for method in methods if method not in page_data]
+    if not missing:
+        return page_data
+
+    page_data.update(extract(page, missing))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so an interrupted run never leaves a partial entry
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(page_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)  # Don't leave a stale partial entry behind
+        raise
+    os.replace(tmp_path, cache_path)
+    return page_data
+
+
+def resolve_page_range(start_page: int, stop_page: int, total_pages: int):
+    """Validate an optional 1-based, inclusive page range; return (start, stop) or None if invalid."""
+    actual_start_page = 1
+    actual_stop_page = total_pages
+
+    if start_page is not None:
+        if 1 <= start_page <= total_pages:
+            actual_start_page = start_page
+        else:
+            print(
+                f"Error: --start-page ({start_page}) is outside the valid range "
+                f"(1 to {total_pages}).",
+                file=sys.stderr,
+            )
+            return None
+
+    if stop_page is not None:
+        if actual_start_page <= stop_page <= total_pages:
+            actual_stop_page = stop_page
+        elif stop_page < actual_start_page:
+            print(
+                f"Error: --stop-page ({stop_page}) cannot be less than "
+                f"--start-page ({actual_start_page}).",
+                file=sys.stderr,
+            )
+            return None
+        else:  # stop_page > total_pages
+            print(
+                f"Error: --stop-page ({stop_page}) is outside the valid range "
+                f"(up to {total_pages}).",
+                file=sys.stderr,
+            )
+            return None
+
+    return actual_start_page, actual_stop_page
+
+
+@lru_cache(maxsize=256)
+def round_half(size) -> float:
+    """Round a font size to the nearest half point (cached; a document uses only a few sizes)."""
+    return round(float(size) * 2) / 2
+
+
+def make_text_segment(word: Dict, texts: List[str], bbox: Dict) -> Dict:
+    """Build a text segment entry from its words' texts, bbox and the font attributes of one of its words."""
+    return {
+        "font": word.get("fontname"),
+        "reported_size": word.get("size"),
+        "rounded_size": round_half(word.get("size", "0")),
+        "direction": "upright" if word.get("upright", True) else "rotated",
+        "text": "".join(texts),
+        "bbox": bbox,
+    }
 
 
-def extract_three_methods(pdf_path: str, y_tolerance: int = 5, x_tolerance: int = 5, words_file: str = None) -> Dict:
-    """Extract text using three different methods and return comparison."""
+def line_starts(tops: List[float], y_tolerance: float) -> List[int]:
+    """
+    Line-grouping kernel: return the index at which each line starts in
+    tops (sorted ascending), followed by len(tops).
+
+    A line starts at each top more than y_tolerance below the first top of
+    the previous line. Works only on the flat tops column, with no access
+    to the word dicts.
+    """
+    starts = [0]
+    line_top = tops[0]
+    for index, top in enumerate(tops):
+        if top - line_top > y_tolerance:  # tops are sorted, so no abs() needed
+            starts.append(index)
+            line_top = top
+    starts.append(len(tops))
+    return starts
+
+
+def process_page(
+    page_data: Dict,
+    page_number: int,
+    page_width: float,
+    page_height: float,
+    y_tolerance: float = 5,
+    x_tolerance: float = 5,
+    methods=METHODS,
+    words_text: bool = False,
+) -> Dict:
+    """
+    Build one page's entries of the extract_three_methods results from its extraction data.
+
+    Returns a dict keyed like the results lists, holding this page's entry
+    for each list it contributes to, plus "words_text" (the page's section of
+    the words file) when words_text is set.
+    """
+    page_num = page_number - 1
+    page_results = {}
+
+    # Method 1: extract_text()
+    if "text" in methods:
+        text_raw = page_data["text"]
+        page_results["extract_text"] = {
+            "page": page_num + 1,
+            "content": text_raw.split("\n") if text_raw else [],
+        }
+
+    # Method 2: extract_text_lines()
+    if "lines" in methods:
+        page_results["extract_text_lines"] = {
+            "page": page_num + 1,
+            "content": page_data["lines"],
+        }
+
+    # Method 3: extract_words() with manual alignment and combining consecutive words
+    # (words is None when the method is not selected)
+    words = page_data.get("words")
+    if words:
+        # 1. Sort words by 'top' (vertical position)
+        sorted_words = sorted(words, key=word_top)
+
+        # 2. Group words into lines by 'top' and y_tolerance
+        starts = line_starts(list(map(word_top, sorted_words)), y_tolerance)
+        lines = [sorted_words[start:stop] for start, stop in zip(starts, starts[1:])]
+
+        # 3. For each line, sort by x0 and combine words
+        combined_lines = []
+        lines_json = []
+
+        for line_number, line in enumerate(lines, 1):
+            line_sorted = sorted(line, key=word_x0)
+
+            # Single pass over the line: combine consecutive words
+            # within x_tolerance and split the line into text segments
+            # by font, size and direction, each with its own bounding box
+            first = line_sorted[0]
+            combined_words = []
+            word_texts = [first["text"]]
+            word_x1 = first["x1"]
+            text_segments = []
+            segment_texts = [first["text"]]
+            seg_x0, seg_top, seg_x1, seg_bottom = word_bbox(first)
+            prev = first
+            prev_key = segment_key(first)
+            for curr in line_sorted[1:]:
+                x0, top, x1, bottom = word_bbox(curr)
+
+                if abs(x0 - word_x1) <= x_tolerance:
+                    word_texts.append(curr["text"])
+                else:
+                    combined_words.append("".join(word_texts))
+                    word_texts = [curr["text"]]
+                word_x1 = x1
+
+                curr_key = segment_key(curr)
+                if curr_key != prev_key:
+                    segment_bbox = {"x0": seg_x0, "top": seg_top, "x1": seg_x1, "bottom": seg_bottom}
+                    text_segments.append(make_text_segment(prev, segment_texts, segment_bbox))
+                    segment_texts = [curr["text"]]
+                    seg_x0, seg_top, seg_x1, seg_bottom = x0, top, x1, bottom
+                else:
+                    segment_texts.append(curr["text"])
+                    # Words are sorted by x0, so a segment's x0 is its first word's
+                    if top < seg_top:
+                        seg_top = top
+                    if x1 > seg_x1:
+                        seg_x1 = x1
+                    if bottom > seg_bottom:
+                        seg_bottom = bottom
+                prev = curr
+                prev_key = curr_key
+            combined_words.append("".join(word_texts))
+            # Add last segment
+            segment_bbox = {"x0": seg_x0, "top": seg_top, "x1": seg_x1, "bottom": seg_bottom}
+            text_segments.append(make_text_segment(prev, segment_texts, segment_bbox))
+
+            # The line's bbox is the union of its segments' bboxes
+            if len(text_segments) == 1:
+                line_bbox = dict(segment_bbox)
+            else:
+                segment_bboxes = [segment["bbox"] for segment in text_segments]
+                line_bbox = {
+                    "x0": first["x0"],
+                    "top": min(bbox["top"] for bbox in segment_bboxes),
+                    "x1": max(bbox["x1"] for bbox in segment_bboxes),
+                    "bottom": max(bbox["bottom"] for bbox in segment_bboxes),
+                }
+
+            # Full line text (all combined words, space separated)
+            full_line_text = " ".join(combined_words)
+            combined_lines.append(full_line_text)
+
+            # Store in new structure
+            lines_json.append(
+                {
+                    "line_number": line_number,
+                    "text": full_line_text,
+                    "bbox": line_bbox,
+                    "text_segments": text_segments,
+                }
+            )
+
+        # 4. Render this page's words and lines for the words file in one string
+        if words_text:
+            # One encoder call per section rather than one per word
+            page_results["words_text"] = "".join(
+                [
+                    f"=== Words (raw, sorted by top), page {page_num + 1} ===\n",
+                    json_text(sorted_words),
+                    "\n\n=== Lines (grouped, with text segments) ===\n",
+                    json_text(
+                        {
+                            "page": page_num + 1,
+                            "lines": lines_json,
+                        }
+                    ),
+                    "\n\n",
+                ]
+            )
+
+        page_results["extract_words_manual"] = {
+            "page": page_num + 1,
+            "content": combined_lines,
+        }
+        # Save raw words for this page (the page number is on the page entry, not each word)
+        page_results["raw_words_by_page"] = {
+            "page": page_num + 1,
+            "words": sorted_words
+        }
+        # Save lines_json for this page
+        page_results["lines_json_by_page"] = {
+            "page": page_num + 1,
+            "lines": lines_json,
+            "page_width": page_width,
+            "page_height": page_height
+        }
+    elif "words" in methods:
+        # Blank page: still emit every entry, as build_comparison expects them
+        page_results["extract_words_manual"] = {
+            "page": page_num + 1,
+            "content": []
+        }
+        page_results["raw_words_by_page"] = {
+            "page": page_num + 1,
+            "words": []
+        }
+        page_results["lines_json_by_page"] = {
+            "page": page_num + 1,
+            "lines": [],
+            "page_width": page_width,
+            "page_height": page_height
+        }
+
+    return page_results
+
+
+def iter_page_results(
+    pdf_path: str,
+    page_numbers: List[int],
+    y_tolerance: float = 5,
+    x_tolerance: float = 5,
+    methods=METHODS,
+    backend: str = "pdfplumber",
+    cache_dir: Path = None,
+    force_refresh: bool = False,
+    words_text: bool = False,
+):
+    """Yield process_page results for the given 1-based page numbers, in order."""
+    for page_number, page_width, page_height, page in iter_backend_pages(pdf_path, page_numbers, backend):
+        page_data = load_page_data(page, page_number, cache_dir, force_refresh, methods, backend)
+        yield process_page(page_data, page_number, page_width, page_height, y_tolerance, x_tolerance, methods, words_text)
+
+
+def process_page_chunk(*args) -> List[Dict]:
+    """Worker entry point: open the PDF once and process a contiguous chunk of pages (see iter_page_results)."""
+    return list(iter_page_results(*args))
+
+
+def extract_three_methods(
+    pdf_path: str,
+    y_tolerance: int = 5,
+    x_tolerance: int = 5,
+    words_file: str = None,
+    start_page: int = None,
+    stop_page: int = None,
+    use_cache: bool = False,
+    force_refresh: bool = False,
+    methods=METHODS,
+    backend: str = "pdfplumber",
+    workers: int = 1,
+    page_sink=None,
+) -> Dict:
+    """
+    Extract text using three different methods and return comparison.
+
+    Only pages start_page..stop_page (1-based, inclusive; default all) are
+    extracted. Returns None if the page range is invalid.
+
+    methods selects which of "text", "lines" and "words" to run (default all
+    three); the comparison is only built when all three are run. backend
+    selects the extractor behind them, "pdfplumber" or "pymupdf".
+
+    With use_cache, the pdfplumber extraction results of each page are kept
+    in an on-disk cache keyed by the PDF's contents, so later runs (e.g. with
+    different tolerances) skip the extraction; force_refresh rebuilds them.
+
+    With more than one worker, the page range is split into contiguous
+    chunks, each processed by its own process; the words file is still
+    written by this process, in page order.
+
+    With page_sink, each finished page's entries (keyed like the results,
+    with "comparison" holding a list of the page's comparison entries) are
+    passed to page_sink before being added to the results, in page order.
+    page_sink may pop the entries it consumes, e.g. to write them out, so
+    that they are not kept in memory.
+    """
     results = {
         "extract_text": [],
         "extract_text_lines": [],
@@ -17,237 +528,121 @@ def extract_three_methods(pdf_path: str, y_tolerance: int = 5, x_tolerance: int
         "raw_words_by_page": [],
     }
 
-    # List of required attributes for word sorting
-    extra_attrs = ["x0", "y0", "x1", "y1", "text", "fontname", "size", "top", "adv"]
-
+    # Page-count check only; the pages themselves are opened by iter_backend_pages
     with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            # Method 1: extract_text()
-            text_raw = page.extract_text()
-            results["extract_text"].append(
-                {
-                    "page": page_num + 1,
-                    "content": text_raw.split("\n") if text_raw else [],
-                }
+        page_range = resolve_page_range(start_page, stop_page, len(pdf.pages))
+    if page_range is None:
+        return None
+    first_page, last_page = page_range
+    page_numbers = list(range(first_page, last_page + 1))
+
+    cache_dir = pdf_cache_dir(pdf_path, backend) if use_cache else None
+    page_args = (y_tolerance, x_tolerance, methods, backend, cache_dir, force_refresh, words_file is not None)
+
+    # The words file, if any, collects the words and lines of every page
+    words_output = open(words_file, "w", encoding="utf-8", buffering=1 << 20) if words_file else nullcontext()
+
+    with words_output as wf, ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        if executor is not None:
+            # Pages are independent, so split them into one contiguous chunk
+            # per worker; each worker opens the PDF once and map() returns
+            # the chunks in page order
+            chunk_size = max(1, -(-len(page_numbers) // workers))  # Ceiling division
+            chunks = [page_numbers[i : i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+            page_results_iter = chain.from_iterable(
+                executor.map(process_page_chunk, repeat(pdf_path), chunks, *(repeat(arg) for arg in page_args))
             )
+        else:
+            page_results_iter = iter_page_results(pdf_path, page_numbers, *page_args)
+
+        # The comparison lines up all three methods
+        compare = all(method in methods for method in METHODS)
+
+        for page_results in page_results_iter:
+            words_chunk = page_results.pop("words_text", None)
+            if words_chunk is not None:
+                wf.write(words_chunk)
+            if compare:
+                page_results["comparison"] = build_comparison(page_results)
+            if page_sink is not None:
+                page_sink(page_results)
+            for key, entry in page_results.items():
+                if key == "comparison":
+                    results[key].extend(entry)
+                else:
+                    results[key].append(entry)
 
-            # Method 2: extract_text_lines()
-            text_lines = page.extract_text_lines(layout=True)
-            results["extract_text_lines"].append(
-                {
-                    "page": page_num + 1,
-                    "content": [line["text"] for line in text_lines] if text_lines else [],
-                }
-            )
+    return results
 
-            # Method 3: extract_words() with manual alignment and combining consecutive words
-            words = page.extract_words(
-                x_tolerance_ratio=0.3,
-                use_text_flow=True,
-                keep_blank_chars=True,
-                extra_attrs=extra_attrs
-            )
-            if words:
-                # 1. Sort words by 'top' (vertical position)
-                sorted_words = sorted(words, key=lambda w: w["top"])
-
-                # 2. Group words into lines by 'top' and y_tolerance
-                lines = []
-                current_line = []
-                prev_top = sorted_words[0]["top"]
-
-                for word in sorted_words:
-                    if abs(word["top"] - prev_top) > y_tolerance:
-                        lines.append(current_line)
-                        current_line = [word]
-                        prev_top = word["top"]
-                    else:
-                        current_line.append(word)
-                if current_line:
-                    lines.append(current_line)
-
-                # 3. For each line, sort by x0 and combine words
-                combined_lines = []
-                line_bboxes = []
-                lines_json = []
-
-                for line_number, line in enumerate(lines, 1):
-                    line_sorted = sorted(line, key=lambda w: w["x0"])
-                    # Combine consecutive words within x_tolerance for full line text
-                    combined_line = []
-                    current_word = line_sorted[0].copy()
-                    for next_word in line_sorted[1:]:
-                        if abs(next_word["x0"] - current_word["x1"]) <= x_tolerance:
-                            current_word["text"] += f"{next_word['text']}"
-                            current_word["x1"] = next_word["x1"]
-                        else:
-                            combined_line.append(current_word)
-                            current_word = next_word.copy()
-                    combined_line.append(current_word)
-                    combined_lines.append(combined_line)
-
-                    # Calculate bounding box for the line
-                    line_bbox = {
-                        "x0": min(w["x0"] for w in line_sorted),
-                        "top": min(w["top"] for w in line_sorted),
-                        "x1": max(w["x1"] for w in line_sorted),
-                        "bottom": max(w["bottom"] for w in line_sorted),
-                    }
-                    line_bboxes.append((line_sorted, line_bbox))
-
-                    # Split line into text segments by font, size, direction
-                    text_segments = []
-                    seg_start = 0
-                    for i in range(1, len(line_sorted)):
-                        prev = line_sorted[i - 1]
-                        curr = line_sorted[i]
-                        if (
-                            prev.get("fontname") != curr.get("fontname")
-                            or prev.get("size") != curr.get("size")
-                            or prev.get("upright", True) != curr.get("upright", True)
-                        ):
-                            segment_words = line_sorted[seg_start:i]
-                            segment_text = "".join(w["text"] for w in segment_words)
-                            segment_bbox = {
-                                "x0": min(w["x0"] for w in segment_words),
-                                "top": min(w["top"] for w in segment_words),
-                                "x1": max(w["x1"] for w in segment_words),
-                                "bottom": max(w["bottom"] for w in segment_words),
-                            }
-                            text_segments.append(
-                                {
-                                    "font": prev.get("fontname"),
-                                    "reported_size": prev.get("size"),
-                                    "rounded_size": round(float(prev.get("size", "0")) * 2) / 2,
-                                    "direction": "upright" if prev.get("upright", True) else "rotated",
-                                    "text": segment_text,
-                                    "bbox": segment_bbox,
-                                }
-                            )
-                            seg_start = i
-                    # Add last segment
-                    segment_words = line_sorted[seg_start:]
-                    if segment_words:
-                        last = segment_words[0]
-                        segment_text = "".join(w["text"] for w in segment_words)
-                        segment_bbox = {
-                            "x0": min(w["x0"] for w in segment_words),
-                            "top": min(w["top"] for w in segment_words),
-                            "x1": max(w["x1"] for w in segment_words),
-                            "bottom": max(w["bottom"] for w in segment_words),
-                        }
-                        text_segments.append(
-                            {
-                                "font": last.get("fontname"),
-                                "reported_size": last.get("size"),
-                                "rounded_size": round(float(last.get("size", "0")) * 2) / 2,
-                                "direction": "upright" if last.get("upright", True) else "rotated",
-                                "text": segment_text,
-                                "bbox": segment_bbox,
-                            }
-                        )
-
-                    # Full line text (all combined words, space separated)
-                    full_line_text = " ".join(w["text"] for w in combined_line)
-
-                    # Store in new structure
-                    lines_json.append(
-                        {
-                            "line_number": line_number,
-                            "text": full_line_text,
-                            "bbox": line_bbox,
-                            "text_segments": text_segments,
-                        }
-                    )
 
-                # 4. Write words and lines to file in one operation
-                if words_file:
-                    with open(words_file, "w", encoding="utf-8") as wf:
-                        wf.write("=== Words (raw, sorted by top) ===\n")
-                        for word in sorted_words:
-                            word_out = word.copy()
-                            word_out["page"] = page_num + 1
-                            wf.write(json.dumps(word_out, indent=2) + "\n")
-                        wf.write("\n=== Lines (grouped, with text segments) ===\n")
-                        json.dump(
-                            {
-                                "page": page_num + 1,
-                                "lines": lines_json,
-                            },
-                            wf,
-                            indent=2,
-                            ensure_ascii=False,
-                        )
-                        wf.write("\n\n")
-
-                results["extract_words_manual"].append(
-                    {
-                        "page": page_num + 1,
-                        "content": [" ".join(w["text"] for w in line) for line in combined_lines],
-                    }
-                )
-                # Save raw words for this page
-                results["raw_words_by_page"].append({
-                    "page": page_num + 1,
-                    "words": [dict(word, page=page_num + 1) for word in sorted_words]
-                })
-                # Save lines_json for this page
-                results["lines_json_by_page"].append({
-                    "page": page_num + 1,
-                    "lines": lines_json,
-                    "page_width": page.width,
-                    "page_height": page.height
-                })
-            else:
-                results["raw_words_by_page"].append({
-                    "page": page_num + 1,
-                    "words": []
-                })
-                results["lines_json_by_page"].append({
-                    "page": page_num + 1,
-                    "lines": [],
-                    "page_width": page.width,
-                    "page_height": page.height
-                })
-
-        # Generate comparison
-        for page_idx in range(len(results["extract_text"])):
-            page_num = page_idx + 1
-
-            # Remove blank lines and normalize spaces for each method's content
-            text_content = [normalize_line(line) for line in results["extract_text"][page_idx]["content"] if line.strip()]
-            lines_content = [normalize_line(line) for line in results["extract_text_lines"][page_idx]["content"] if line.strip()]
-            words_content = [normalize_line(line) for line in results["extract_words_manual"][page_idx]["content"] if line.strip()]
-
-            methods = {
-                "text": text_content,
-                "lines": lines_content,
-                "words": words_content,
-            }
-
-            max_lines = max(len(methods["text"]), len(methods["lines"]), len(methods["words"]))
-
-            for line_idx in range(max_lines):
-                comparison_entry = {
-                    "page": page_num,
-                    "line": line_idx + 1,
-                    "methods": {},
-                }
+def build_comparison(page_results: Dict) -> List[Dict]:
+    """Line up one page's extract_text, extract_text_lines and extract_words_manual entries line by line."""
+    page_num = page_results["extract_text"]["page"]
+
+    # Remove blank lines and normalize spaces for each method's content
+    text_content = [normalize_line(line) for line in page_results["extract_text"]["content"] if line.strip()]
+    lines_content = [normalize_line(line) for line in page_results["extract_text_lines"]["content"] if line.strip()]
+    words_content = [normalize_line(line) for line in page_results["extract_words_manual"]["content"] if line.strip()]
+
+    # Shorter methods are padded with None
+    return [
+        {
+            "page": page_num,
+            "line": line_idx,
+            "methods": {"text": text, "lines": line, "words": words},
+        }
+        for line_idx, (text, line, words) in enumerate(
+            zip_longest(text_content, lines_content, words_content), 1
+        )
+    ]
+
+
+def count_differences(comparison: List[Dict]) -> int:
+    """Count the comparison entries whose methods disagree (ignoring missing lines)."""
+    return sum(
+        1
+        for entry in comparison
+        if len(set(v for v in entry["methods"].values() if v is not None)) > 1
+    )
 
-                for method in methods:
-                    try:
-                        content = methods[method][line_idx]
-                        comparison_entry["methods"][method] = content
-                    except IndexError:
-                        comparison_entry["methods"][method] = None
 
-                results["comparison"].append(comparison_entry)
+def json_text(data) -> str:
+    """Return data as 2-space indented JSON text."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
-    return results
+
+def json_line(data) -> bytes:
+    """Return data as one line of compact JSON (a JSON Lines record), UTF-8 encoded."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_json(path: str, data) -> None:
+    """Write data to path as UTF-8, 2-space indented JSON, replacing path only once it is complete."""
+    # Write to a temporary file first so an interrupted run never leaves a partial output
+    tmp_path = f"{path}.tmp"
+    try:
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+    except BaseException:
+        # Don't leave a stale partial output behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
 
 
 def normalize_line(line):
-    return re.sub(r'\s+', ' ', line).strip()
+    # str.split() splits on exactly the characters \s matches, so this equals
+    # re.sub(r"\s+", " ", line).strip() without running a regex per line
+    return " ".join(line.split())
 
 
 def main():
@@ -289,8 +684,65 @@ def main():
         action="store_true",
         help="If set, save comparison of three methods to <basename>_compare.json",
     )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Write the lines, words and compare outputs as JSON Lines (.jsonl, one entry per line) "
+        "as each page finishes, instead of holding every page in memory",
+    )
+    parser.add_argument(
+        "--method",
+        choices=METHODS + ("all",),
+        default=None,
+        help="Run only one extraction method instead of all three (default: all with --compare, otherwise "
+        "words, the only method the lines and words outputs need)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pdfplumber",
+        help="Text extraction backend; pymupdf is much faster but groups and names text differently (default: pdfplumber)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes used to extract pages in parallel (default: 1, serial)",
+    )
+    parser.add_argument(
+        "-s",
+        "--start-page",
+        type=int,
+        default=None,
+        help="First page to process (1-based, default: 1)",
+    )
+    parser.add_argument(
+        "-e",
+        "--stop-page",
+        type=int,
+        default=None,
+        help="Last page to process (1-based, inclusive, default: last page)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Cache per-page extraction results under {CACHE_ROOT} and reuse them on later runs",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="With --cache, ignore cached pages and extract them again",
+    )
 
     args = parser.parse_args()
+    if args.method is None:
+        # text and lines each take another full pass over the page's
+        # characters, and only feed the comparison and its statistics
+        args.method = "all" if args.compare else "words"
+    methods = METHODS if args.method == "all" else (args.method,)
+    if args.compare and args.method != "all":
+        parser.error("--compare needs all three methods (--method all)")
 
     # Determine base name
     if args.basename:
@@ -301,49 +753,67 @@ def main():
     # Ensure output directory exists
     os.makedirs(args.output_dir, exist_ok=True)
 
-    # Run extraction
-    results = extract_three_methods(args.input_pdf, args.tolerance, args.x_tolerance)
+    # With --jsonl, these results are written one entry per line as each
+    # page finishes and are not kept in the returned results
+    jsonl_paths = {}
+    if args.jsonl:
+        if "words" in methods:
+            jsonl_paths["lines_json_by_page"] = os.path.join(args.output_dir, f"{base}_lines.jsonl")
+            if args.save_words:
+                jsonl_paths["raw_words_by_page"] = os.path.join(args.output_dir, f"{base}_words.jsonl")
+        if args.compare:
+            jsonl_paths["comparison"] = os.path.join(args.output_dir, f"{base}_compare.jsonl")
+
+    # Statistics that would otherwise need the streamed results are counted per page
+    page_count = 0
+    total_differences = None
+
+    def consume_page(page_results):
+        nonlocal page_count, total_differences
+        page_count += 1
+        if page_results.get("comparison"):
+            total_differences = (total_differences or 0) + count_differences(page_results["comparison"])
+        if not args.jsonl:
+            return
+        # Streamed results are written if requested and dropped either way
+        for key in ("lines_json_by_page", "raw_words_by_page", "comparison"):
+            entry = page_results.pop(key, None)
+            if entry is not None and key in jsonl_files:
+                jsonl_files[key].writelines(map(json_line, entry if key == "comparison" else [entry]))
 
-    # Save lines_json_by_page to <output_dir>/<basename>_lines.json
-    lines_path = os.path.join(args.output_dir, f"{base}_lines.json")
-    with open(lines_path, "w", encoding="utf-8") as f:
-        json.dump(results["lines_json_by_page"], f, indent=2, ensure_ascii=False)
+    # Run extraction
+    with ExitStack() as stack:
+        jsonl_files = {key: stack.enter_context(open(path, "wb")) for key, path in jsonl_paths.items()}
+        results = extract_three_methods(
+            args.input_pdf,
+            args.tolerance,
+            args.x_tolerance,
+            start_page=args.start_page,
+            stop_page=args.stop_page,
+            use_cache=args.cache,
+            force_refresh=args.force_refresh,
+            methods=methods,
+            backend=args.backend,
+            workers=args.workers,
+            page_sink=consume_page,
+        )
+    if results is None:
+        sys.exit(1)
+
+    # Save lines_json_by_page to <output_dir>/<basename>_lines.json (built by the words method)
+    if "words" in methods and not args.jsonl:
+        lines_path = os.path.join(args.output_dir, f"{base}_lines.json")
+        write_json(lines_path, results["lines_json_by_page"])
 
     # Save raw_words_by_page to <output_dir>/<basename>_words.json if requested
-    if args.save_words:
+    if args.save_words and "words" in methods and not args.jsonl:
         words_path = os.path.join(args.output_dir, f"{base}_words.json")
-        with open(words_path, "w", encoding="utf-8") as f:
-            json.dump(results["raw_words_by_page"], f, indent=2, ensure_ascii=False)
+        write_json(words_path, results["raw_words_by_page"])
 
     # Save comparison to <output_dir>/<basename>_compare.json if requested
-    if args.compare:
-        # Remove blank lines and normalize for comparison
-        for page_idx in range(len(results["extract_text"])):
-            text_content = [normalize_line(line) for line in results["extract_text"][page_idx]["content"] if line.strip()]
-            lines_content = [normalize_line(line) for line in results["extract_text_lines"][page_idx]["content"] if line.strip()]
-            words_content = [normalize_line(line) for line in results["extract_words_manual"][page_idx]["content"] if line.strip()]
-            methods = {
-                "text": text_content,
-                "lines": lines_content,
-                "words": words_content,
-            }
-            max_lines = max(len(methods["text"]), len(methods["lines"]), len(methods["words"]))
-            for line_idx in range(max_lines):
-                comparison_entry = {
-                    "page": page_idx + 1,
-                    "line": line_idx + 1,
-                    "methods": {},
-                }
-                for method in methods:
-                    try:
-                        content = methods[method][line_idx]
-                        comparison_entry["methods"][method] = content
-                    except IndexError:
-                        comparison_entry["methods"][method] = None
-                results["comparison"].append(comparison_entry)
+    if args.compare and not args.jsonl:
         compare_path = os.path.join(args.output_dir, f"{base}_compare.json")
-        with open(compare_path, "w", encoding="utf-8") as f:
-            json.dump(results["comparison"], f, indent=2, ensure_ascii=False)
+        write_json(compare_path, results["comparison"])
 
     # Restore metadata and statistics
     metadata = {
@@ -352,23 +822,16 @@ def main():
         "x_tolerance": args.x_tolerance,
     }
     statistics = {
-        "page_count": len(results["extract_text"]),
+        "page_count": page_count,
         "avg_lines_per_page": {
-            "extract_text": sum(len(p["content"]) for p in results["extract_text"]) / len(results["extract_text"]),
-            "extract_text_lines": sum(len(p["content"]) for p in results["extract_text_lines"]) / len(results["extract_text_lines"]),
-            "extract_words_manual": sum(len(p["content"]) for p in results["extract_words_manual"]) / len(results["extract_words_manual"]),
+            METHOD_RESULTS[method]: sum(len(p["content"]) for p in results[METHOD_RESULTS[method]]) / len(results[METHOD_RESULTS[method]])
+            for method in methods
+            if results[METHOD_RESULTS[method]]
         },
-        "total_differences": (
-            sum(
-                1
-                for entry in results["comparison"]
-                if len(set(v for v in entry["methods"].values() if v is not None)) > 1
-            ) if "comparison" in results and results["comparison"] else None
-        ),
+        "total_differences": total_differences,
     }
     info_path = os.path.join(args.output_dir, f"{base}_info.json")
-    with open(info_path, "w", encoding="utf-8") as f:
-        json.dump({"metadata": metadata, "statistics": statistics}, f, indent=2, ensure_ascii=False)
+    write_json(info_path, {"metadata": metadata, "statistics": statistics})
 
 
 if __name__ == "__main__":
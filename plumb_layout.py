@@ -1,8 +1,19 @@
 import argparse
 import json
+import mmap
 import os
 import re
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, namedtuple
+from functools import lru_cache
+from operator import itemgetter, sub
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser and serializer
+    orjson = None
+
+# Bounding box coordinates of a line, in column order
+bbox_fields = itemgetter("x0", "top", "x1", "bottom")
 
 
 def parse_page_range(page_range, max_page, exclude_pages=None):
@@ -21,17 +32,37 @@ def parse_page_range(page_range, max_page, exclude_pages=None):
     return sorted(pages)
 
 
-def is_line_empty(line):
-    return not line.get("text", "").strip()
+def page_bitmap(pages, max_page):
+    # One byte per page number of the document, set for the selected pages;
+    # pages past the end of the document can never match and are left out
+    bitmap = bytearray(max_page + 1)
+    for page_num in pages:
+        if 0 <= page_num <= max_page:
+            bitmap[page_num] = 1
+    return bitmap
+
+
+def line_top(line):
+    # Sort key for lines; a plain function call measured faster here than
+    # pre-extracting the tops and sorting indices against them
+    return line["bbox"]["top"]
+
+
+def line_columns(lines):
+    """Return the x0, top, x1 and bottom columns of the lines' bboxes, as parallel tuples."""
+    if not lines:
+        return (), (), (), ()
+    return tuple(zip(*(bbox_fields(line["bbox"]) for line in lines)))
 
 
 def find_margins(lines, page_width, page_height):
     if not lines:
         return {"left": None, "right": None, "top": None, "bottom": None}
-    left = min(line["bbox"]["x0"] for line in lines)
-    right = max(line["bbox"]["x1"] for line in lines)
-    top = min(line["bbox"]["top"] for line in lines)
-    bottom = max(line["bbox"]["bottom"] for line in lines)
+    x0s, tops, x1s, bottoms = line_columns(lines)
+    left = min(x0s)
+    right = max(x1s)
+    top = min(tops)
+    bottom = max(bottoms)
     return {
         "left": left,
         "right": page_width - right,
@@ -40,107 +71,114 @@ def find_margins(lines, page_width, page_height):
     }
 
 
-def round_font_size(size):
-    try:
-        return round(float(size) * 2) / 2
-    except Exception:
-        return size
+# One row of the vertical layout: a line, or the unused space after the last line
+Region = namedtuple("Region", "unused used left_indent right_indent fonts preview")
 
 
-def analyze_vertical_layout(lines, page_height, page_width):
+def analyze_vertical_layout(lines, page_height, page_width, presorted=False):
+    # With presorted, lines are already in top order and are not sorted again
     regions = []
     if not lines:
         return regions
-    sorted_lines = sorted(lines, key=lambda l: l["bbox"]["top"])
-    prev_bottom = 0
-    for line in sorted_lines:
-        top = line["bbox"]["top"]
-        bottom = line["bbox"]["bottom"]
-        x0 = line["bbox"]["x0"]
-        x1 = line["bbox"]["x1"]
-        left_indent = round(x0, 2)
-        right_indent = round(page_width - x1, 2)
-        unused = round(top - prev_bottom, 2)
-        used = round(bottom - top, 2)
-        fonts = set()
+    sorted_lines = lines if presorted else sorted(lines, key=line_top)
+    # Read the bbox coordinates once, as columns, rather than per field per line,
+    # and do the spacing and indent arithmetic a whole column at a time
+    x0s, tops, x1s, bottoms = line_columns(sorted_lines)
+    prev_bottoms = (0,) + bottoms[:-1]  # Each line's gap is measured from the previous line's bottom
+    unused_column = [round(gap, 2) for gap in map(sub, tops, prev_bottoms)]
+    used_column = [round(height, 2) for height in map(sub, bottoms, tops)]
+    left_column = [round(x0, 2) for x0 in x0s]
+    right_column = [round(page_width - x1, 2) for x1 in x1s]
+    for line, unused, used, left_indent, right_indent in zip(
+        sorted_lines, unused_column, used_column, left_column, right_column
+    ):
+        # A line has only a few distinct fonts, so a list with a linear
+        # membership check de-duplicates them faster than a set
+        fonts = []
         for seg in line.get("text_segments", []):
-            font = seg.get("font", "")
-            rounded_size = seg.get("rounded_size", "")
-            fonts.add(f"{font} {rounded_size}")
+            font = f"{seg.get('font', '')} {seg.get('rounded_size', '')}"
+            if font not in fonts:
+                fonts.append(font)
+        fonts.sort()
         preview = line.get("text", "")[:60].replace("\n", " ")
-        regions.append(
-            {
-                "unused": unused,
-                "used": used,
-                "left_indent": left_indent,
-                "right_indent": right_indent,
-                "fonts": sorted(fonts),
-                "preview": preview,
-            }
-        )
-        prev_bottom = bottom
+        regions.append(Region(unused, used, left_indent, right_indent, fonts, preview))
     # Add unused space after last line
-    unused = round(page_height - prev_bottom, 2)
-    regions.append(
-        {
-            "unused": unused,
-            "used": None,
-            "left_indent": None,
-            "right_indent": None,
-            "fonts": [],
-            "preview": "",
-        }
-    )
+    unused = round(page_height - bottoms[-1], 2)
+    regions.append(Region(unused, None, None, None, [], ""))
     return regions
 
 
 def display_vertical_layout_table(regions):
     FONT_NAME_WIDTH = 24
     FONT_SIZE_WIDTH = 6
-    FONT_COL_WIDTH = FONT_NAME_WIDTH + FONT_SIZE_WIDTH + 1  # +1 for space
 
-    print(f"{'Line':>5} {'Unused':>8} {'Used':>8} {'Left':>8} {'Right':>8} {'Font':<{FONT_NAME_WIDTH}} {'Size':>{FONT_SIZE_WIDTH}} {'Preview'}")
+    # Build the column templates once instead of re-parsing the width specs per row
+    cells = f"{{:>5}} {{:>8}} {{:>8}} {{:>8}} {{:>8}} {{:<{FONT_NAME_WIDTH}.{FONT_NAME_WIDTH}}} {{:>{FONT_SIZE_WIDTH}}}"
+    format_cells = cells.format
+    format_row = (cells + " {}").format
+
+    rows = [format_row("Line", "Unused", "Used", "Left", "Right", "Font", "Size", "Preview")]
     line_num = 1
+    last_idx = len(regions) - 1
     for idx, reg in enumerate(regions):
-        unused = f"{reg['unused']:.2f}" if reg["unused"] is not None else "-"
-        used = f"{reg['used']:.2f}" if reg["used"] is not None else "-"
-        left_indent = f"{reg['left_indent']:.2f}" if reg["left_indent"] is not None else "-"
-        right_indent = f"{reg['right_indent']:.2f}" if reg["right_indent"] is not None else "-"
-        fonts = reg["fonts"]
-        preview = reg["preview"]
-        is_last = idx == len(regions) - 1
-
-        if not fonts and not is_last:
-            print(f"{'':>5} {unused:>8} {used:>8} {left_indent:>8} {right_indent:>8} {'':<{FONT_NAME_WIDTH}} {'':>{FONT_SIZE_WIDTH}}")
-            continue
+        unused = f"{reg.unused:.2f}" if reg.unused is not None else "-"
+        fonts = reg.fonts
 
-        if is_last:
+        if idx == last_idx:
             # Last row: show line number, unused, and dashes for other fields
-            print(f"{line_num:>5} {unused:>8} {'-':>8} {'-':>8} {'-':>8} {'-':<{FONT_NAME_WIDTH}} {'-':>{FONT_SIZE_WIDTH}}")
-        else:
-            for i, font in enumerate(fonts):
-                if " " in font:
-                    font_name, font_size = font.rsplit(" ", 1)
-                else:
-                    font_name, font_size = font, ""
-                if i == 0:
-                    print(f"{line_num:>5} {unused:>8} {used:>8} {left_indent:>8} {right_indent:>8} {font_name:<{FONT_NAME_WIDTH}.{FONT_NAME_WIDTH}} {font_size:>{FONT_SIZE_WIDTH}} {preview}")
-                else:
-                    print(f"{'':>5} {'':>8} {'':>8} {'':>8} {'':>8} {font_name:<{FONT_NAME_WIDTH}.{FONT_NAME_WIDTH}} {font_size:>{FONT_SIZE_WIDTH}}")
-            line_num += 1
+            rows.append(format_cells(line_num, unused, "-", "-", "-", "-", "-"))
+            continue
 
+        used = f"{reg.used:.2f}" if reg.used is not None else "-"
+        left_indent = f"{reg.left_indent:.2f}" if reg.left_indent is not None else "-"
+        right_indent = f"{reg.right_indent:.2f}" if reg.right_indent is not None else "-"
 
-def collect_fonts(lines):
+        if not fonts:
+            rows.append(format_cells("", unused, used, left_indent, right_indent, "", ""))
+            continue
+
+        for i, font in enumerate(fonts):
+            if " " in font:
+                font_name, font_size = font.rsplit(" ", 1)
+            else:
+                font_name, font_size = font, ""
+            if i == 0:
+                rows.append(format_row(line_num, unused, used, left_indent, right_indent, font_name, font_size, reg.preview))
+            else:
+                rows.append(format_cells("", "", "", "", "", font_name, font_size))
+        line_num += 1
+
+    print("\n".join(rows))
+
+
+@lru_cache(maxsize=256)
+def format_font_size(rounded_size):
+    return f"{float(rounded_size):.1f}"
+
+
+def collect_font_sizes(lines):
+    # Most segments repeat a few (font, size) pairs, so de-duplicate the
+    # pairs first; a dict keeps them in first-seen order
+    return dict.fromkeys(
+        (seg.get("font", ""), seg.get("rounded_size", ""))
+        for line in lines
+        for seg in line.get("text_segments", [])
+    )
+
+
+def group_font_sizes(font_sizes):
     font_counter = defaultdict(set)
-    for line in lines:
-        for seg in line.get("text_segments", []):
-            font = seg.get("font", "")
-            rounded_size = seg.get("rounded_size", "")
-            rounded_size_str = f"{float(rounded_size):.1f}"
-            font_counter[font].add(rounded_size_str)
+    for font, rounded_size in font_sizes:
+        font_counter[font].add(format_font_size(rounded_size))
     return font_counter
 
 
+def collect_fonts(lines):
+    return group_font_sizes(collect_font_sizes(lines))
+
+
+# Rounded spacings repeat heavily across lines and pages
+@lru_cache(maxsize=4096)
 def round_to_quarter(val):
     try:
         return round(float(val) * 4) / 4
@@ -154,6 +192,7 @@ def print_spacing_table(title, counter, by_indent=None):
         # Unused spacing table
         gt1 = []
         eq1 = []
+        # Partitioning the sorted items keeps both lists in sorted order
         for val, count in sorted(counter.items(), key=lambda x: float(x[0])):
             if count > 1:
                 gt1.append((val, count))
@@ -162,7 +201,7 @@ def print_spacing_table(title, counter, by_indent=None):
         for val, count in gt1:
             print(f"  {val:>6} {count}")
         if eq1:
-            eq1_sorted = ", ".join(str(v) for v in sorted(eq1, key=float))
+            eq1_sorted = ", ".join(str(v) for v in eq1)
             print(f"  Occurred 1x: {eq1_sorted}")
         print()
     else:
@@ -188,11 +227,28 @@ def print_spacing_table(title, counter, by_indent=None):
                 for indent_val, indent_count in gt1:
                     print(f"{'':>12} {indent_val:>10} {indent_count:>8}")
                 if eq1:
-                    eq1_sorted = ", ".join(str(v) for v in sorted(eq1, key=float))
+                    eq1_sorted = ", ".join(str(v) for v in eq1)
                     print(f"{'':>22} {'1x:':>10} {eq1_sorted}")
                 print()
 
 
+def load_json(path):
+    if orjson is not None:
+        # orjson parses the file's bytes in place through a read-only map,
+        # so neither a decoded str nor a bytes copy of the input is made
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def to_json_bytes(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze PDF layout from plumb3.py lines JSON")
     parser.add_argument("input_json", help="Input lines JSON file")
@@ -202,80 +258,84 @@ def main():
     parser.add_argument("--text-view", action="store_true", help="Show vertical layout as plain text instead of table")
     args = parser.parse_args()
 
-    with open(args.input_json, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(args.input_json)
 
     max_page = max(page["page"] for page in data)
     exclude_pages = [int(x) for x in args.exclude_pages.split(",")] if args.exclude_pages else []
     pages_to_process = parse_page_range(args.pages, max_page, exclude_pages)
+    selected_pages = page_bitmap(pages_to_process, max_page)
 
     os.makedirs(args.output, exist_ok=True)
 
-    all_fonts = defaultdict(set)
+    # Distinct (font, rounded size) pairs of the whole document, grouped by font after the last page
+    doc_font_sizes = {}
     total_lines = 0
     total_unused = 0.0
 
+    # Pages of sorted, non-empty lines; saved as both sorted_lines.json and filtered_lines.json
     sorted_data = []
-    filtered_data = []
 
     doc_used_counter = Counter()
     doc_unused_counter = Counter()
     doc_used_by_indent = defaultdict(Counter)  # used_size -> left_indent -> count
 
+    # Select the pages to lay out and validate their dimensions once, before any output
+    layout_pages = []
     for page in data:
         page_num = page["page"]
-        if page_num not in pages_to_process:
+        if not selected_pages[page_num]:
             continue
-        lines = [line for line in page["lines"] if not is_line_empty(line)]
+        # Drop lines with no visible text; the test is inlined in the comprehension
+        lines = [line for line in page["lines"] if line.get("text", "").strip()]
         if not lines:
             continue
-
-        # Get page dimensions from the JSON
-        try:
-            page_width = page["page_width"]
-            page_height = page["page_height"]
-        except KeyError:
+        if "page_width" not in page or "page_height" not in page:
             raise ValueError(f"Page {page_num} is missing 'page_width' or 'page_height' in the JSON.")
-        
+        layout_pages.append((page_num, lines, page["page_width"], page["page_height"]))
+
+    for page_num, lines, page_width, page_height in layout_pages:
+        # Sort the page's lines once, for the layout analysis and the saved data
+        sorted_lines = sorted(lines, key=line_top)
+
         print(f"\nPage {page_num} (width={page_width:.2f}, height={page_height:.2f})")
         margins = find_margins(lines, page_width, page_height)
         print(f"Margins: left={margins['left']:.2f}, right={margins['right']:.2f}, top={margins['top']:.2f}, bottom={margins['bottom']:.2f}")
-        regions = analyze_vertical_layout(lines, page_height, page_width)
+        regions = analyze_vertical_layout(sorted_lines, page_height, page_width, presorted=True)
         if args.text_view:
             for reg in regions:
-                if reg["used"] is not None:
-                    print(f"{reg['unused']:.2f}-{reg['used']:.2f}: {reg['preview']}")
+                if reg.used is not None:
+                    print(f"{reg.unused:.2f}-{reg.used:.2f}: {reg.preview}")
         else:
             display_vertical_layout_table(regions)
         # Font collection
-        fonts = collect_fonts(lines)
-        for font, sizes in fonts.items():
-            all_fonts[font].update(sizes)
+        doc_font_sizes.update(collect_font_sizes(lines))
         total_lines += len(lines)
-        total_unused += sum(reg["used"] for reg in regions if reg["used"] is not None)
         # Save sorted and filtered data
-        sorted_lines = sorted(lines, key=lambda l: l["bbox"]["top"])
         sorted_data.append({"page": page_num, "lines": sorted_lines})
-        filtered_data.append({"page": page_num, "lines": sorted_lines})
 
         # --- Collect per-page used/unused stats ---
-        page_used_counter = Counter()
-        page_unused_counter = Counter()
-        page_used_by_indent = defaultdict(Counter)
+        # One pass over the regions gathers the values, which are then
+        # rounded and counted with batch updates
+        used_values = []
+        unused_values = []
+        used_indents = Counter()  # (rounded used, rounded left indent) -> count
         for reg in regions:
-            if reg["used"] is not None:
-                used_rounded = round_to_quarter(reg["used"])
-                page_used_counter[used_rounded] += 1
-                doc_used_counter[used_rounded] += 1
-            if reg["unused"] is not None:
-                unused_rounded = round_to_quarter(reg["unused"])
-                page_unused_counter[unused_rounded] += 1
-                doc_unused_counter[unused_rounded] += 1
-            if reg["used"] is not None and reg["left_indent"] is not None:
-                used_rounded = round_to_quarter(reg["used"])
-                left_indent_rounded = round(reg["left_indent"])
-                doc_used_by_indent[used_rounded][left_indent_rounded] += 1
-                page_used_by_indent[used_rounded][left_indent_rounded] += 1
+            used = reg.used
+            if used is not None:
+                used_values.append(used)
+                if reg.left_indent is not None:
+                    used_indents[round_to_quarter(used), round(reg.left_indent)] += 1
+            if reg.unused is not None:
+                unused_values.append(reg.unused)
+        total_unused += sum(used_values)
+        page_used_counter = Counter(map(round_to_quarter, used_values))
+        page_unused_counter = Counter(map(round_to_quarter, unused_values))
+        doc_used_counter.update(page_used_counter)
+        doc_unused_counter.update(page_unused_counter)
+        page_used_by_indent = defaultdict(Counter)
+        for (used, left_indent), count in used_indents.items():
+            page_used_by_indent[used][left_indent] += count
+            doc_used_by_indent[used][left_indent] += count
 
         # --- Print per-page stats ---
         print()
@@ -283,12 +343,14 @@ def main():
         print_spacing_table("  Unused spacing (rounded to 0.25):", page_unused_counter)
 
     # Save sorted and filtered JSON
-    with open(os.path.join(args.output, "sorted_lines.json"), "w", encoding="utf-8") as f:
-        json.dump(sorted_data, f, indent=2, ensure_ascii=False)
-    with open(os.path.join(args.output, "filtered_lines.json"), "w", encoding="utf-8") as f:
-        json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+    # The two files hold the same data, so it is encoded only once
+    encoded = to_json_bytes(sorted_data)
+    for name in ("sorted_lines.json", "filtered_lines.json"):
+        with open(os.path.join(args.output, name), "wb") as f:
+            f.write(encoded)
 
     # Font summary
+    all_fonts = group_font_sizes(doc_font_sizes)
     print("\nFont summary:")
     for font, sizes in all_fonts.items():
         # Only use the rounded sizes, sort and display
@@ -5,8 +5,18 @@ import subprocess
 import sys
 import json
 import argparse
+import io
+import os
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from fnmatch import fnmatch
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser and serializer
+    orjson = None
+
 
 def create_test_fixture(pages, output_name):
     """Create test fixture from H.264 data with specified pages.
@@ -20,15 +30,27 @@ def create_test_fixture(pages, output_name):
     """
     h264_blocks_path = Path("output/h264_100pages_blocks.json")
 
-    with open(h264_blocks_path, 'r') as f:
-        full_data = json.load(f)
+    if orjson is not None:
+        full_data = orjson.loads(h264_blocks_path.read_bytes())
+    else:
+        with open(h264_blocks_path, 'r') as f:
+            full_data = json.load(f)
 
     all_pages = full_data.get('pages', [])
 
-    # Find requested pages
+    # Find requested pages in one pass, stopping once all of them are found
+    wanted_pages = set(pages)
+    found_pages = {}
+    for page_data in all_pages:
+        page_num = page_data.get('page')
+        if page_num in wanted_pages and page_num not in found_pages:
+            found_pages[page_num] = page_data
+            if len(found_pages) == len(wanted_pages):
+                break
+
     selected_pages = []
     for page_num in pages:
-        page_data = next((p for p in all_pages if p.get('page') == page_num), None)
+        page_data = found_pages.get(page_num)
         if not page_data:
             raise ValueError(f"Page {page_num} not found in H.264 data")
         selected_pages.append(page_data)
@@ -38,13 +60,86 @@ def create_test_fixture(pages, output_name):
 
     # Save to temp location
     fixture_path = Path(f"output/temp_{output_name}.json")
-    with open(fixture_path, 'w') as f:
-        json.dump(fixture, f, indent=2)
+    if orjson is not None:
+        fixture_path.write_bytes(orjson.dumps(fixture, option=orjson.OPT_INDENT_2))
+    else:
+        with open(fixture_path, 'w') as f:
+            json.dump(fixture, f, indent=2)
 
     return fixture_path
 
 
-def run_analysis(fixture_path, test_name, expected_toc_count=None):
+def find_newest_files(directory, patterns):
+    """Find the most recently modified file matching each pattern.
+
+    Scans the directory once with os.scandir, whose entries cache their
+    stat results, instead of globbing and stat-ing once per pattern.
+
+    Args:
+        directory: Directory to scan
+        patterns: Glob-style file name patterns
+
+    Returns:
+        Dict mapping each pattern to the newest matching Path, or None
+    """
+    newest = dict.fromkeys(patterns)
+    newest_mtime = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            for pattern in patterns:
+                if fnmatch(entry.name, pattern):
+                    mtime = entry.stat().st_mtime
+                    if pattern not in newest_mtime or mtime > newest_mtime[pattern]:
+                        newest_mtime[pattern] = mtime
+                        newest[pattern] = Path(entry.path)
+    return newest
+
+
+def run_pdf_plumb(cmd, in_process=False):
+    """Run a `uv run pdf-plumb ...` command and report whether it succeeded.
+
+    By default the command runs as a subprocess. With in_process=True it
+    runs in this interpreter through the pdf_plumb Click CLI instead, so the
+    pipeline is imported once and reused by later analyses; it falls back to
+    the subprocess when pdf_plumb is not importable here. The command that
+    actually runs is printed.
+
+    Args:
+        cmd: Full command, starting with "uv", "run", "pdf-plumb"
+        in_process: Run the command in this interpreter
+
+    Returns:
+        Tuple of (succeeded, error output)
+    """
+    cli = None
+    if in_process:
+        try:
+            from pdf_plumb.cli import cli
+        except ImportError:
+            print("⚠️  pdf_plumb is not importable here; running as a subprocess")
+
+    if cli is not None:
+        print(f"🔧 Running in-process: pdf-plumb {' '.join(cmd[3:])}")
+        print()
+        # Capture the CLI output like the subprocess path does
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                exit_code = cli.main(args=cmd[3:], prog_name="pdf-plumb", standalone_mode=False)
+        except SystemExit as e:
+            return not e.code, output.getvalue()
+        except Exception:
+            # Report the traceback, as a failed subprocess would on stderr
+            return False, output.getvalue() + traceback.format_exc()
+        return not exit_code, output.getvalue()
+
+    print(f"🔧 Running: {' '.join(cmd)}")
+    print()
+    result = subprocess.run(cmd, check=False, capture_output=True, text=True)
+    return result.returncode == 0, result.stderr
+
+
+def run_analysis(fixture_path, test_name, expected_toc_count=None, in_process=False):
     """Run LLM analysis and return results summary."""
 
     # Run the LLM analysis
@@ -56,26 +151,23 @@ def run_analysis(fixture_path, test_name, expected_toc_count=None):
         "--output-dir", "output/"
     ]
 
-    print(f"🔧 Running: {' '.join(cmd)}")
     print("⏱️  This will take 1-2 minutes...")
-    print()
+    succeeded, error_output = run_pdf_plumb(cmd, in_process)
 
-    result = subprocess.run(cmd, check=False, capture_output=True, text=True)
-
-    if result.returncode != 0:
+    if not succeeded:
         print("❌ Analysis failed:")
-        print(result.stderr)
+        print(error_output)
         return None
 
     print("✅ Analysis completed successfully!")
     print()
 
-    # Find the generated review files
-    output_dir = Path("output")
-
-    # Find most recent files
-    review_files = list(output_dir.glob("llm_optimized_format_*.txt"))
-    results_files = list(output_dir.glob("llm_headers_footers_*_results.json"))
+    # Find the most recent generated review files
+    review_pattern = "llm_optimized_format_*.txt"
+    results_pattern = "llm_headers_footers_*_results.json"
+    newest = find_newest_files("output", (review_pattern, results_pattern))
+    latest_review = newest[review_pattern]
+    latest_results = newest[results_pattern]
 
     analysis_summary = {
         'test_name': test_name,
@@ -85,13 +177,11 @@ def run_analysis(fixture_path, test_name, expected_toc_count=None):
         'results_file': None
     }
 
-    if review_files:
-        latest_review = max(review_files, key=lambda p: p.stat().st_mtime)
+    if latest_review:
         analysis_summary['review_file'] = latest_review
         print(f"📋 Manual Review File: {latest_review}")
 
-    if results_files:
-        latest_results = max(results_files, key=lambda p: p.stat().st_mtime)
+    if latest_results:
         analysis_summary['results_file'] = latest_results
 
         # Count TOC entries in results
@@ -121,6 +211,8 @@ def main():
                         help='Page numbers to analyze (default: [6])')
     parser.add_argument('--expected', type=int,
                         help='Expected TOC count for accuracy calculation')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run each analysis in this interpreter instead of a separate `uv run pdf-plumb` process')
 
     args = parser.parse_args()
 
@@ -149,7 +241,7 @@ def main():
         print("\n1️⃣  SINGLE-PAGE TEST")
         print("-" * 30)
         single_fixture = create_test_fixture([6], "single_page_6")
-        single_result = run_analysis(single_fixture, "Single-Page", 55)
+        single_result = run_analysis(single_fixture, "Single-Page", 55, args.in_process)
         if single_result:
             results.append(single_result)
 
@@ -157,7 +249,7 @@ def main():
         print("\n2️⃣  TWO-PAGE TEST")
         print("-" * 30)
         two_fixture = create_test_fixture([6, 7], "pages_6_7")
-        two_result = run_analysis(two_fixture, "Two-Page", 117)
+        two_result = run_analysis(two_fixture, "Two-Page", 117, args.in_process)
         if two_result:
             results.append(two_result)
 
@@ -203,7 +295,7 @@ def main():
         fixture_path = create_test_fixture(pages, fixture_name)
         print(f"📄 Using fixture: {fixture_path}")
 
-        result = run_analysis(fixture_path, test_name, expected)
+        result = run_analysis(fixture_path, test_name, expected, args.in_process)
 
         if result:
             print("\n🔬 Manual Verification Steps:")
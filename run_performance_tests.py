@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Quick script to run TOC extraction performance tests."""
 
+import argparse
 import subprocess
 import sys
 from pathlib import Path
@@ -8,6 +9,10 @@ from pathlib import Path
 
 def main():
     """Run performance tests with proper environment setup."""
+    parser = argparse.ArgumentParser(description="Run TOC extraction performance tests")
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run pytest in this interpreter instead of a separate `uv run pytest` process')
+    args = parser.parse_args()
 
     print("🚀 Running TOC Extraction Performance Tests")
     print("="*50)
@@ -26,10 +31,24 @@ def main():
         "-v", "--tb=short"
     ]
 
-    print(f"🔧 Running: {' '.join(cmd)}")
+    # With --in-process, run pytest in this interpreter when it is
+    # available, instead of starting a second Python and re-importing everything
+    pytest = None
+    if args.in_process:
+        try:
+            import pytest
+        except ImportError:
+            print("⚠️  pytest is not importable here; running as a subprocess")
+
+    if pytest is not None:
+        print(f"🔧 Running in-process: pytest {' '.join(cmd[3:])}")
+    else:
+        print(f"🔧 Running: {' '.join(cmd)}")
     print()
 
     try:
+        if pytest is not None:
+            return int(pytest.main(cmd[3:]))
         result = subprocess.run(cmd, check=False)
         return result.returncode
     except KeyboardInterrupt:
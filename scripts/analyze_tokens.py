@@ -25,14 +25,25 @@ Requirements:
 """
 
 import argparse
+import io
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache
+from glob import glob
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 # Add the src directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser and serializer
+    orjson = None
+
 try:
     from pdf_plumb.utils.token_counter import (
         DocumentTokenAnalyzer, 
@@ -60,6 +71,8 @@ def print_detailed_results(stats: Dict[str, Any], recommendations: Dict[str, Any
     print(f"  Sampling strategy:")
     print(f"    - First {sampling['first_pages']} pages")
     print(f"    - {sampling['random_pages']} random pages (starting from page {sampling['random_start_page']})")
+    if sampling.get('estimated_pages'):
+        print(f"    - {sampling['estimated_pages']} page counts estimated from JSON length")
     
     if stats['sample_pages'][:10]:
         sample_preview = stats['sample_pages'][:10]
@@ -120,23 +133,167 @@ def print_summary(stats: Dict[str, Any], recommendations: Dict[str, Any]):
     print(f"➕ Recommended incremental: {rec['recommended_incremental']} pages")
     print(f"📈 Max single batch: {rec['recommended_pages']} pages")
 
-def save_results(stats: Dict[str, Any], recommendations: Dict[str, Any], output_path: str):
-    """Save analysis results to JSON file."""
+def input_signature(input_path: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    """Describe the input file and settings that determine the analysis results."""
+    stat = input_path.stat()
+    return {
+        'file': str(input_path.resolve()),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'model': args.model,
+        'first_pages': args.first_pages,
+        'random_sample': args.random_sample,
+        'random_start': args.random_start,
+        'seed': args.seed,
+        'calibration_pages': args.calibration_pages
+    }
+
+def load_saved_results(output_path, signature: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Load previously saved results if they were computed from the same inputs.
+
+    Returns:
+        Tuple of (stats, recommendations), or None if there are no matching results
+    """
+    try:
+        if orjson is not None:
+            saved = orjson.loads(Path(output_path).read_bytes())
+        else:
+            with open(output_path, 'r') as f:
+                saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if saved.get('analysis_metadata', {}).get('input_signature') != signature:
+        return None
+    return saved['statistics'], saved['recommendations']
+
+def save_results(stats: Dict[str, Any], recommendations: Dict[str, Any], output_path: str,
+                 signature: Optional[Dict[str, Any]] = None, pretty: bool = False):
+    """Save analysis results to JSON file, indented only if pretty is set."""
     results = {
         'analysis_metadata': {
             'cli_version': '1.0',
             'file_analyzed': stats['file_analyzed'],
-            'model_used': stats['model_used']
+            'model_used': stats['model_used'],
+            'input_signature': signature
         },
         'statistics': stats,
         'recommendations': recommendations
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        Path(output_path).write_bytes(orjson.dumps(results, option=option))
+    else:
+        Path(output_path).write_text(json.dumps(results, indent=2 if pretty else None))
     
     print(f"\n💾 Detailed results saved to: {output_path}")
 
+def existing_file(value: str) -> Path:
+    """Argparse type for an input file that must exist."""
+    path = Path(value)
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(f"File not found: {path}")
+    return path
+
+def positive_int(value: str) -> int:
+    """Argparse type for an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid integer: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Must be at least 1: {number}")
+    return number
+
+@lru_cache(maxsize=None)
+def get_analyzer(model: str, seed: int, num_threads: Optional[int]) -> DocumentTokenAnalyzer:
+    """Get an analyzer for the settings, created once per process."""
+    return DocumentTokenAnalyzer(model=model, random_seed=seed, num_threads=num_threads)
+
+def analyze_file(input_path: Path, args: argparse.Namespace) -> int:
+    """Analyze one file, print and save its results, and return an exit code."""
+    if not input_path.suffix.lower() == '.json':
+        print(f"⚠️  Warning: File doesn't have .json extension: {input_path}")
+    
+    # Generate output path if not provided
+    if args.output:
+        output_path = args.output
+    else:
+        output_dir = input_path.parent
+        base_name = input_path.stem
+        output_path = output_dir / f"{base_name}_token_analysis.json"
+    
+    # Display model info
+    if not args.quiet:
+        model_info = get_model_info(args.model)
+        print(f"🤖 Using model: {model_info['name']}")
+        print(f"📊 Context limit: {model_info['context_limit']:,} tokens")
+        print(f"🔄 Processing file: {input_path}")
+    
+    try:
+        # Reuse the saved results when the input file and settings are unchanged
+        signature = input_signature(input_path, args)
+        saved = None if args.force else load_saved_results(output_path, signature)
+        
+        if saved:
+            stats, recommendations = saved
+            print(f"♻️  Input unchanged, reusing results from: {output_path}")
+        else:
+            # Initialize analyzer
+            analyzer = get_analyzer(args.model, args.seed, args.threads)
+            
+            # Perform analysis
+            stats = analyzer.analyze_document(
+                str(input_path),
+                first_n_pages=args.first_pages,
+                random_sample_size=args.random_sample,
+                random_start_page=args.random_start,
+                calibration_pages=args.calibration_pages
+            )
+            
+            # Generate recommendations
+            recommendations = analyzer.recommend_batch_sizes(stats)
+        
+        # Display results
+        if args.quiet:
+            print_summary(stats, recommendations)
+        else:
+            print_detailed_results(stats, recommendations)
+            print_summary(stats, recommendations)
+        
+        # Save results
+        if not saved:
+            save_results(stats, recommendations, output_path, signature, pretty=args.pretty)
+        
+        return 0
+        
+    except ImportError as e:
+        print(f"❌ Error: Missing required package. Please install tiktoken:")
+        print(f"   uv add tiktoken")
+        print(f"   Error details: {e}")
+        return 1
+    except FileNotFoundError as e:
+        print(f"❌ Error: File not found: {e}")
+        return 1
+    except json.JSONDecodeError as e:
+        print(f"❌ Error: Invalid JSON file: {e}")
+        return 1
+    except Exception as e:
+        print(f"❌ Error during analysis: {e}")
+        if not args.quiet:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+def analyze_file_captured(input_path: Path, args: argparse.Namespace) -> Tuple[int, str]:
+    """Analyze one file in a batch worker, returning its exit code and printed output."""
+    # Capture stderr too, so a traceback stays with the output of its file
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
+        exit_code = analyze_file(input_path, args)
+    return exit_code, output.getvalue()
+
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(
@@ -148,17 +305,26 @@ Examples:
   {sys.argv[0]} output/h264_100pages_blocks.json --model gpt-4o
   {sys.argv[0]} data.json --first-pages 20 --random-sample 15
   {sys.argv[0]} data.json --output custom_results.json --quiet
+  {sys.argv[0]} --batch "output/*_lines.json"
 
 Available models: {', '.join(get_available_models())}
 Default model: {get_default_model()}
         """
     )
     
-    # Required arguments
-    parser.add_argument(
+    # Input: one file, or a batch of files matching a pattern
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument(
         'file_path',
+        nargs='?',
+        type=existing_file,
         help='Path to JSON file containing PDF document data'
     )
+    inputs.add_argument(
+        '--batch', '-b',
+        metavar='PATTERN',
+        help='Analyze every file matching a glob pattern (e.g. "output/*_lines.json") in parallel'
+    )
     
     # Optional arguments
     parser.add_argument(
@@ -191,6 +357,7 @@ Default model: {get_default_model()}
     
     parser.add_argument(
         '--output', '-o',
+        type=Path,
         help='Output file for detailed results (default: auto-generated based on input file)'
     )
     
@@ -200,6 +367,12 @@ Default model: {get_default_model()}
         help='Show only summary, skip detailed output'
     )
     
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent the saved results JSON (default: compact)'
+    )
+    
     parser.add_argument(
         '--seed',
         type=int,
@@ -207,79 +380,67 @@ Default model: {get_default_model()}
         help='Random seed for reproducible sampling (default: 42)'
     )
     
+    parser.add_argument(
+        '--calibration-pages', '-c',
+        type=positive_int,
+        help='Tokenize only this many sampled pages and estimate the rest from '
+             'their JSON length (default: tokenize every sampled page)'
+    )
+    
+    parser.add_argument(
+        '--threads', '-t',
+        type=positive_int,
+        help='Number of threads for batch token counting (default: CPU count, '
+             'or CPU count divided by --workers with --batch)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-j',
+        type=positive_int,
+        default=os.cpu_count(),
+        help='Number of worker processes for --batch (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-analyze even if saved results for the same input and settings exist'
+    )
+    
     args = parser.parse_args()
     
-    # Validate input file
-    input_path = Path(args.file_path)
-    if not input_path.exists():
-        print(f"❌ Error: File not found: {input_path}")
+    if not args.batch:
+        # The input file is checked to exist while parsing arguments
+        return analyze_file(args.file_path, args)
+    
+    if args.output:
+        parser.error("--output cannot be used with --batch")
+    
+    # Skip result files from earlier runs that match the same pattern
+    files = sorted(
+        path for path in map(Path, glob(args.batch, recursive=True))
+        if path.is_file() and not path.name.endswith('_token_analysis.json')
+    )
+    if not files:
+        print(f"❌ Error: No files match: {args.batch}")
         return 1
     
-    if not input_path.suffix.lower() == '.json':
-        print(f"⚠️  Warning: File doesn't have .json extension: {input_path}")
+    if args.threads is None:
+        # Share the CPUs between the workers rather than giving each one an
+        # encoder thread per CPU
+        args.threads = max(1, (os.cpu_count() or 1) // args.workers)
     
-    # Generate output path if not provided
-    if args.output:
-        output_path = args.output
-    else:
-        output_dir = input_path.parent
-        base_name = input_path.stem
-        output_path = output_dir / f"{base_name}_token_analysis.json"
+    print(f"🔄 Analyzing {len(files)} files with {args.workers} workers")
     
-    # Display model info
-    if not args.quiet:
-        model_info = get_model_info(args.model)
-        print(f"🤖 Using model: {model_info['name']}")
-        print(f"📊 Context limit: {model_info['context_limit']:,} tokens")
-        print(f"🔄 Processing file: {input_path}")
+    # Each worker reuses one analyzer and encoder for all of its files; the
+    # output of each file is printed whole, in file order
+    exit_codes = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for exit_code, output in executor.map(analyze_file_captured, files, [args] * len(files)):
+            print(output, end='')
+            exit_codes.append(exit_code)
     
-    try:
-        # Initialize analyzer
-        analyzer = DocumentTokenAnalyzer(
-            model=args.model,
-            random_seed=args.seed
-        )
-        
-        # Perform analysis
-        stats = analyzer.analyze_document(
-            str(input_path),
-            first_n_pages=args.first_pages,
-            random_sample_size=args.random_sample,
-            random_start_page=args.random_start
-        )
-        
-        # Generate recommendations
-        recommendations = analyzer.recommend_batch_sizes(stats)
-        
-        # Display results
-        if args.quiet:
-            print_summary(stats, recommendations)
-        else:
-            print_detailed_results(stats, recommendations)
-            print_summary(stats, recommendations)
-        
-        # Save results
-        save_results(stats, recommendations, output_path)
-        
-        return 0
-        
-    except ImportError as e:
-        print(f"❌ Error: Missing required package. Please install tiktoken:")
-        print(f"   uv add tiktoken")
-        print(f"   Error details: {e}")
-        return 1
-    except FileNotFoundError as e:
-        print(f"❌ Error: File not found: {e}")
-        return 1
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON file: {e}")
-        return 1
-    except Exception as e:
-        print(f"❌ Error during analysis: {e}")
-        if not args.quiet:
-            import traceback
-            traceback.print_exc()
-        return 1
+    return max(exit_codes)
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
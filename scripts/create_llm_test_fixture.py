@@ -11,6 +11,13 @@ import argparse
 from pathlib import Path
 from typing import List, Dict, Any
 
+from index_document_json import load_page_index, load_indexed_document
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser and serializer
+    orjson = None
+
 
 def extract_pages_from_json(
     json_file: Path, 
@@ -27,10 +34,18 @@ def extract_pages_from_json(
         test_description: Description of what this test case validates
     """
     
-    # Load full document data
+    # Load document data; with a current page index, only the requested pages are parsed
     print(f"Loading document data from {json_file}")
-    with open(json_file, 'r') as f:
-        doc_data = json.load(f)
+    index = load_page_index(json_file)
+    if index is not None:
+        doc_data = load_indexed_document(
+            json_file, index, pages, fields=('page_dimensions', 'extraction_method')
+        )
+    elif orjson is not None:
+        doc_data = orjson.loads(json_file.read_bytes())
+    else:
+        with open(json_file, 'r') as f:
+            doc_data = json.load(f)
     
     # Validate we have pages data
     if 'pages' not in doc_data:
@@ -41,14 +56,17 @@ def extract_pages_from_json(
     
     print(f"Document has {total_pages} pages")
     
-    # Validate requested pages exist
-    invalid_pages = [p for p in pages if p < 1 or p > total_pages]
-    if invalid_pages:
+    # Normalize the requested pages once; duplicates are extracted only once
+    requested_pages = sorted(set(pages))
+    
+    # Validate requested pages exist; only the lowest and highest need checking
+    if requested_pages and (requested_pages[0] < 1 or requested_pages[-1] > total_pages):
+        invalid_pages = [p for p in requested_pages if p < 1 or p > total_pages]
         raise ValueError(f"Invalid page numbers: {invalid_pages}. Document has pages 1-{total_pages}")
     
     # Extract requested pages (convert to 0-based indexing)
     extracted_pages = []
-    for page_num in sorted(pages):
+    for page_num in requested_pages:
         page_index = page_num - 1
         page_data = all_pages[page_index]
         
@@ -65,7 +83,7 @@ def extract_pages_from_json(
             "description": test_description,
             "source_document": str(json_file.name),
             "extracted_pages": pages,
-            "total_pages": len(pages),
+            "total_pages": len(requested_pages),
             "created_by": "create_llm_test_fixture.py"
         },
         "document_info": {
@@ -79,8 +97,10 @@ def extract_pages_from_json(
     # Save test fixture
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w') as f:
-        json.dump(test_fixture, f, indent=2)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(test_fixture, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        output_file.write_text(json.dumps(test_fixture, indent=2))
     
     print(f"Created test fixture: {output_file}")
     print(f"Test fixture contains {len(extracted_pages)} pages with {sum(len(p.get('blocks', [])) for p in extracted_pages)} total blocks")
@@ -22,48 +22,53 @@ import mkdocs_gen_files
 from pathlib import Path
 import re
 
-def transform_claude_links(content: str) -> str:
+# Direct link mappings; links are rewritten on the raw UTF-8 bytes,
+# since the links themselves are ASCII
+DIRECT_MAPPINGS = {
+    b"docs/test_docstring_guidelines.md": b"test_docstring_guidelines.md",
+    b"docs/architecture.md": b"architecture.md",
+    b"docs/design-decisions.md": b"design-decisions.md", 
+    b"docs/phase-history.md": b"phase-history.md",
+    b"docs/status.md": b"status.md",
+    b"docs/cli-usage.md": b"cli-usage.md"
+}
+
+# All direct mappings in one pattern, so they are applied in a single scan
+DIRECT_LINK_PATTERN = re.compile(b"|".join(map(re.escape, DIRECT_MAPPINGS)))
+
+# Pattern-based transformations for design/ and analysis/ directories
+DESIGN_LINK_PATTERN = re.compile(rb'docs/design/([^)]+\.md)')
+ANALYSIS_LINK_PATTERN = re.compile(rb'docs/analysis/([^)]+\.md)')
+
+def transform_claude_links(content: bytes) -> bytes:
     """
     Transform CLAUDE.md links for mkdocs context.
     
     Args:
-        content: Original CLAUDE.md content
+        content: Original CLAUDE.md content, as UTF-8 bytes
         
     Returns:
         Content with transformed links for docs site
     """
-    # Direct link mappings
-    direct_mappings = {
-        "docs/test_docstring_guidelines.md": "test_docstring_guidelines.md",
-        "docs/architecture.md": "architecture.md",
-        "docs/design-decisions.md": "design-decisions.md", 
-        "docs/phase-history.md": "phase-history.md",
-        "docs/status.md": "status.md",
-        "docs/cli-usage.md": "cli-usage.md"
-    }
-    
     # Apply direct mappings
-    for original, replacement in direct_mappings.items():
-        content = content.replace(original, replacement)
+    content = DIRECT_LINK_PATTERN.sub(lambda m: DIRECT_MAPPINGS[m.group(0)], content)
     
-    # Pattern-based transformations for design/ and analysis/ directories
     # Transform docs/design/*.md → design/*.md
-    content = re.sub(r'docs/design/([^)]+\.md)', r'design/\1', content)
+    content = DESIGN_LINK_PATTERN.sub(rb'design/\1', content)
     
     # Transform docs/analysis/*.md → analysis/*.md
-    content = re.sub(r'docs/analysis/([^)]+\.md)', r'analysis/\1', content)
+    content = ANALYSIS_LINK_PATTERN.sub(rb'analysis/\1', content)
     
     return content
 
 # Read original CLAUDE.md from project root
 claude_path = Path("CLAUDE.md")
 if claude_path.exists():
-    with open(claude_path, "r", encoding="utf-8") as f:
-        original_content = f.read()
+    original_content = claude_path.read_bytes()
     
     # Transform links for docs context
     transformed_content = transform_claude_links(original_content)
     
     # Write transformed version to docs site as development.md
-    with mkdocs_gen_files.open("development.md", "w") as f:
+    with mkdocs_gen_files.open("development.md", "wb") as f:
         f.write(transformed_content)
\ No newline at end of file
@@ -17,41 +17,42 @@ a docs-friendly version for the mkdocs site.
 
 import mkdocs_gen_files
 from pathlib import Path
+import re
 
-def transform_readme_links(content: str) -> str:
+# Link mappings for docs context; links are rewritten on the raw UTF-8
+# bytes, since the links themselves are ASCII
+LINK_MAPPINGS = {
+    b"docs/cli-usage.md": b"cli-usage.md",
+    b"docs/output-files.md": b"output-files.md",
+    b"docs/architecture.md": b"architecture.md",
+    b"docs/design-decisions.md": b"design-decisions.md",
+    b"CLAUDE.md": b"development.md"
+}
+
+# All mappings in one pattern, so they are applied in a single scan
+LINK_PATTERN = re.compile(b"|".join(map(re.escape, LINK_MAPPINGS)))
+
+def transform_readme_links(content: bytes) -> bytes:
     """
     Transform README.md links for mkdocs context.
     
     Args:
-        content: Original README.md content
+        content: Original README.md content, as UTF-8 bytes
         
     Returns:
         Content with transformed links for docs site
     """
-    # Link mappings for docs context
-    link_mappings = {
-        "docs/cli-usage.md": "cli-usage.md",
-        "docs/output-files.md": "output-files.md",
-        "docs/architecture.md": "architecture.md",
-        "docs/design-decisions.md": "design-decisions.md",
-        "CLAUDE.md": "development.md"
-    }
-    
     # Apply transformations
-    for original, replacement in link_mappings.items():
-        content = content.replace(original, replacement)
-    
-    return content
+    return LINK_PATTERN.sub(lambda m: LINK_MAPPINGS[m.group(0)], content)
 
 # Read original README.md from project root
 readme_path = Path("README.md")
 if readme_path.exists():
-    with open(readme_path, "r", encoding="utf-8") as f:
-        original_content = f.read()
+    original_content = readme_path.read_bytes()
     
     # Transform links for docs context
     transformed_content = transform_readme_links(original_content)
     
     # Write transformed version to docs site
-    with mkdocs_gen_files.open("readme.md", "w") as f:
+    with mkdocs_gen_files.open("readme.md", "wb") as f:
         f.write(transformed_content)
\ No newline at end of file
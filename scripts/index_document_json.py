@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Build a page index for large document JSON files.
+
+The index is a sidecar file (<file>.pageidx) holding the byte offsets of each
+entry of the document's 'pages' array and of its other top-level values. Tools
+such as create_llm_test_fixture.py use it to memory-map the document and parse
+only the pages they need, instead of loading the whole file.
+
+Usage:
+    python scripts/index_document_json.py output/h264_100pages_blocks.json
+"""
+
+import json
+import mmap
+import re
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser and serializer
+    orjson = None
+
+INDEX_SUFFIX = ".pageidx"
+
+# JSON strings and structural characters; everything else (numbers,
+# literals, whitespace) only matters as part of a value span
+TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:,]')
+
+WHITESPACE = b" \t\r\n"
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def index_path_for(json_file: Path) -> Path:
+    """Return the sidecar index path for a document JSON file."""
+    return json_file.with_name(json_file.name + INDEX_SUFFIX)
+
+
+def _strip_span(mm: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    """Shrink a byte span to exclude surrounding whitespace."""
+    while start < end and mm[start] in WHITESPACE:
+        start += 1
+    while end > start and mm[end - 1] in WHITESPACE:
+        end -= 1
+    return start, end
+
+
+def build_page_index(json_file: Path) -> Dict[str, Any]:
+    """Scan a document JSON file once and record its page and field offsets.
+
+    Args:
+        json_file: Path to a JSON object with a 'pages' array
+
+    Returns:
+        Index with the source file's size and mtime, the (start, end) byte
+        span of each page and of each top-level value
+
+    Raises:
+        ValueError: If the file is not a JSON object with a 'pages' array
+    """
+    stat = json_file.stat()
+    fields = {}
+    pages = []
+    depth = 0
+    key = None  # Current top-level key
+    value_start = None  # Start of the current top-level value
+    element_start = None  # Start of the current entry of the pages array
+
+    with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in TOKEN_PATTERN.finditer(mm):
+            token = match.group()
+            if depth == 0 and token != b'{':
+                raise ValueError("JSON file must contain an object with a 'pages' array")
+
+            if depth == 1:
+                if key is None and token[0] == ord('"'):
+                    key = json.loads(token)
+                elif token == b':':
+                    value_start = match.end()
+                elif token in (b',', b'}') and key is not None:
+                    fields[key] = _strip_span(mm, value_start, match.start())
+                    key = None
+            elif depth == 2 and key == 'pages' and token in (b',', b']'):
+                start, end = _strip_span(mm, element_start, match.start())
+                if start < end:
+                    pages.append((start, end))
+                element_start = match.end()
+
+            if token in (b'{', b'['):
+                depth += 1
+                if depth == 2 and key == 'pages':
+                    element_start = match.end()
+            elif token in (b'}', b']'):
+                depth -= 1
+
+    if 'pages' not in fields:
+        raise ValueError("JSON file must contain 'pages' array")
+
+    return {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "pages": pages,
+        "fields": fields,
+    }
+
+
+def write_page_index(json_file: Path) -> Path:
+    """Build the page index for a document and save it next to the document."""
+    index = build_page_index(json_file)
+    index_path = index_path_for(json_file)
+    if orjson is not None:
+        index_path.write_bytes(orjson.dumps(index))
+    else:
+        index_path.write_text(json.dumps(index))
+    return index_path
+
+
+def load_page_index(json_file: Path) -> Optional[Dict[str, Any]]:
+    """Load a document's page index if it exists and matches the document.
+
+    Returns:
+        The index, or None if there is no index or the document has changed
+        since it was built
+    """
+    index_path = index_path_for(json_file)
+    try:
+        index = loads(index_path.read_bytes())
+        stat = json_file.stat()
+    except (OSError, ValueError):
+        return None
+
+    if index.get("source_size") != stat.st_size or index.get("source_mtime_ns") != stat.st_mtime_ns:
+        return None
+    return index
+
+
+def load_indexed_document(
+    json_file: Path,
+    index: Dict[str, Any],
+    pages: Iterable[int],
+    fields: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """Load only the requested pages and top-level fields of an indexed document.
+
+    Args:
+        json_file: Path to the document JSON file
+        index: Page index from load_page_index()
+        pages: Page numbers to load (1-based indexing)
+        fields: Top-level fields to load besides 'pages'
+
+    Returns:
+        Document dict shaped like the full document, whose 'pages' list has
+        the document's length but holds None for pages that were not requested
+    """
+    page_spans = index["pages"]
+    field_spans = index["fields"]
+    all_pages = [None] * len(page_spans)
+
+    with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        doc_data = {
+            field: loads(mm[start:end])
+            for field, (start, end) in field_spans.items()
+            if field in fields
+        }
+        for page_num in set(pages):
+            if 1 <= page_num <= len(page_spans):
+                start, end = page_spans[page_num - 1]
+                all_pages[page_num - 1] = loads(mm[start:end])
+
+    doc_data['pages'] = all_pages
+    return doc_data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build page index sidecar files for document JSON files"
+    )
+    parser.add_argument(
+        "json_files",
+        type=Path,
+        nargs="+",
+        help="Document JSON files to index"
+    )
+
+    args = parser.parse_args()
+
+    for json_file in args.json_files:
+        try:
+            index_path = write_page_index(json_file)
+        except (OSError, ValueError) as e:
+            print(f"Error indexing {json_file}: {e}")
+            return 1
+        print(f"Created page index: {index_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
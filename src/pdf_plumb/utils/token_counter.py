@@ -26,11 +26,12 @@ Future Model Support:
 """
 
 import json
+import os
 import random
 import statistics
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-import tiktoken
 
 # Model configurations for token counting
 MODEL_CONFIGS = {
@@ -65,6 +66,27 @@ MODEL_CONFIGS = {
 DEFAULT_MODEL = "gpt-4.1"
 
 
+@lru_cache(maxsize=None)
+def get_encoder(encoding_name: str) -> "tiktoken.Encoding":
+    """Get the tiktoken encoder for an encoding, built once per process.
+
+    tiktoken is imported here rather than at module level, so the model
+    configuration helpers can be used without paying for the import.
+
+    Args:
+        encoding_name: tiktoken encoding name (e.g. "o200k_base")
+
+    Returns:
+        Shared encoder instance
+
+    Raises:
+        ImportError: If tiktoken is not installed
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
 class TokenCounter:
     """Precise token counting for various LLM models."""
 
@@ -83,7 +105,7 @@ class TokenCounter:
             raise ValueError(f"Unsupported model: {model}. Available: {available}")
 
         self.config = MODEL_CONFIGS[model]
-        self.encoder = tiktoken.get_encoding(self.config["encoder"])
+        self.encoder = get_encoder(self.config["encoder"])
 
         # Future model support framework
         # self._setup_additional_models()
@@ -126,6 +148,32 @@ class TokenCounter:
         else:
             raise ValueError(f"Token counting not implemented for model: {self.model}")
 
+    def count_tokens_batch(self, texts: List[str], num_threads: Optional[int] = None) -> List[int]:
+        """Count tokens for several texts in one call.
+
+        Uses tiktoken's batch encoder, which tokenizes the texts in parallel
+        native threads. Special-token markup is counted as ordinary text.
+
+        Args:
+            texts: Texts to count tokens for
+            num_threads: Number of encoder threads (default: CPU count)
+
+        Returns:
+            Number of tokens for each text, in order
+
+        Raises:
+            ValueError: If token counting not implemented for model
+        """
+        if not self.model.startswith("gpt"):
+            raise ValueError(f"Token counting not implemented for model: {self.model}")
+
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        return [
+            len(tokens)
+            for tokens in self.encoder.encode_ordinary_batch(texts, num_threads=num_threads)
+        ]
+
     def _count_gemini_tokens(self, text: str) -> int:
         """Count tokens for Gemini models.
 
@@ -171,15 +219,17 @@ class TokenCounter:
 class DocumentTokenAnalyzer:
     """Analyze token requirements for PDF document data."""
 
-    def __init__(self, model: str = DEFAULT_MODEL, random_seed: int = 42):
+    def __init__(self, model: str = DEFAULT_MODEL, random_seed: int = 42, num_threads: Optional[int] = None):
         """Initialize document token analyzer.
 
         Args:
             model: Model name for token counting
             random_seed: Seed for reproducible random sampling
+            num_threads: Encoder threads for batch token counting (default: CPU count)
         """
         self.counter = TokenCounter(model)
         self.random_seed = random_seed
+        self.num_threads = num_threads
 
     def count_page_tokens(self, page_data: Dict[str, Any]) -> Dict[str, int]:
         """Count tokens for a single page's data.
@@ -193,8 +243,24 @@ class DocumentTokenAnalyzer:
         # Convert page data to JSON string to get realistic representation
         page_json = json.dumps(page_data, indent=None)
 
+        return self._page_token_stats(page_data, page_json, self.counter.count_tokens(page_json))
+
+    @staticmethod
+    def _page_token_stats(
+        page_data: Dict[str, Any], page_json: str, total_tokens: int
+    ) -> Dict[str, Any]:
+        """Build a page's token count entry from an already computed token count.
+
+        Args:
+            page_data: Page data dictionary
+            page_json: The page's JSON string, as tokenized
+            total_tokens: Number of tokens in page_json
+
+        Returns:
+            Dictionary with token counts and metadata
+        """
         return {
-            "total_tokens": self.counter.count_tokens(page_json),
+            "total_tokens": total_tokens,
             "raw_length": len(page_json),
             "block_count": len(
                 page_data.get("lines", [])
@@ -208,6 +274,7 @@ class DocumentTokenAnalyzer:
         first_n_pages: int = 30,
         random_sample_size: int = 10,
         random_start_page: int = 31,
+        calibration_pages: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Analyze token requirements for document.
 
@@ -216,10 +283,19 @@ class DocumentTokenAnalyzer:
             first_n_pages: Number of initial pages to analyze
             random_sample_size: Number of random pages to sample
             random_start_page: Starting page for random sampling
+            calibration_pages: If set, tokenize only this many evenly spaced
+                sampled pages and estimate the others from their JSON length
+                using the calibration pages' tokens-per-character ratio
 
         Returns:
             Dictionary containing analysis results
+
+        Raises:
+            ValueError: If calibration_pages is less than 1
         """
+        if calibration_pages is not None and calibration_pages < 1:
+            raise ValueError(f"calibration_pages must be at least 1, got {calibration_pages}")
+
         # Set random seed for reproducible results
         random.seed(self.random_seed)
 
@@ -257,14 +333,41 @@ class DocumentTokenAnalyzer:
         # Combine sample
         sample_pages = first_pages + random_pages
 
-        # Count tokens for each page
-        page_stats = []
-        for page in sample_pages:
-            stats = self.count_page_tokens(page)
-            page_stats.append(stats)
+        page_jsons = [json.dumps(page, indent=None) for page in sample_pages]
+        estimated = [False] * len(page_jsons)
+        if calibration_pages and calibration_pages < len(page_jsons):
+            # Tokenize an evenly spaced subset of the pages and estimate the
+            # rest from their length
+            calibration = [
+                round(i * len(page_jsons) / calibration_pages) for i in range(calibration_pages)
+            ]
+            calibration_counts = self.counter.count_tokens_batch(
+                [page_jsons[i] for i in calibration], self.num_threads
+            )
+            calibration_chars = sum(len(page_jsons[i]) for i in calibration)
+            tokens_per_char = (
+                sum(calibration_counts) / calibration_chars if calibration_chars else 0
+            )
+            token_counts = [round(len(page_json) * tokens_per_char) for page_json in page_jsons]
+            estimated = [True] * len(page_jsons)
+            for i, count in zip(calibration, calibration_counts):
+                token_counts[i] = count
+                estimated[i] = False
+        else:
+            # Count tokens for all sampled pages in one batch
+            token_counts = self.counter.count_tokens_batch(page_jsons, self.num_threads)
+
+        page_stats = [
+            {
+                **self._page_token_stats(page, page_json, total_tokens),
+                "estimated": is_estimated,
+            }
+            for page, page_json, total_tokens, is_estimated in zip(
+                sample_pages, page_jsons, token_counts, estimated
+            )
+        ]
 
         # Calculate statistics
-        token_counts = [p["total_tokens"] for p in page_stats]
         block_counts = [p["block_count"] for p in page_stats]
 
         results = {
@@ -277,6 +380,7 @@ class DocumentTokenAnalyzer:
                 "first_pages": len(first_pages),
                 "random_pages": len(random_pages),
                 "random_start_page": random_start_page,
+                "estimated_pages": sum(estimated),
             },
             "token_stats": {
                 "min": min(token_counts) if token_counts else 0,
@@ -0,0 +1,143 @@
+"""Unit tests for the plumb3.py extraction comparison script."""
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+import plumb3
+
+
+class FakePage:
+    """Stand-in for a pdfplumber page with no characters (blank or image-only)."""
+
+    def __init__(self, page_number, width=612, height=792):
+        self.page_number = page_number
+        self.width = width
+        self.height = height
+        self.chars = []
+
+
+class FakePDF:
+    """Stand-in for pdfplumber.open()'s PDF, usable as a context manager."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestBlankPages:
+    """Test that pages without characters produce empty entries for every method."""
+
+    def test_process_page_blank_page_has_all_entries(self):
+        """Test process_page() emits an empty entry per method for a blank page.
+
+        Test setup:
+        - Page data as extract_page_data() returns it for a page without chars
+        - All three methods selected (the default)
+
+        What it verifies:
+        - extract_words_manual is present with empty content, alongside the
+          raw words and line entries
+        - build_comparison() accepts the result and returns no lines
+
+        Key insight: The comparison reads every method's entry, so a blank
+        page that skips one of them would raise KeyError under --compare.
+        """
+        page_data = {"text": "", "lines": [], "words": []}
+
+        page_results = plumb3.process_page(page_data, 1, 612, 792)
+
+        assert page_results["extract_words_manual"] == {"page": 1, "content": []}
+        assert page_results["raw_words_by_page"] == {"page": 1, "words": []}
+        assert page_results["lines_json_by_page"]["lines"] == []
+        assert plumb3.build_comparison(page_results) == []
+
+    def test_extract_three_methods_compare_with_blank_page(self, monkeypatch):
+        """Test extract_three_methods() builds the comparison for a PDF with blank pages.
+
+        Test setup:
+        - pdfplumber.open() patched to return a two-page PDF whose pages have no chars
+        - All three methods selected, so the comparison is built
+
+        What it verifies:
+        - Each method has one empty entry per page
+        - The comparison is built without error and is empty
+
+        Key insight: Regression test for blank pages skipping the
+        extract_words_manual entry when running with --compare.
+        """
+        pdf = FakePDF([FakePage(1), FakePage(2)])
+        monkeypatch.setattr(plumb3.pdfplumber, "open", lambda path: pdf)
+
+        results = plumb3.extract_three_methods("blank.pdf")
+
+        assert results["extract_words_manual"] == [
+            {"page": 1, "content": []},
+            {"page": 2, "content": []},
+        ]
+        assert [entry["content"] for entry in results["extract_text"]] == [[], []]
+        assert [entry["content"] for entry in results["extract_text_lines"]] == [[], []]
+        assert results["comparison"] == []
+
+    def test_extract_three_methods_pdf_without_pages(self, monkeypatch):
+        """Test extract_three_methods() returns empty results for a PDF with no pages.
+
+        Test setup:
+        - pdfplumber.open() patched to return a PDF with an empty page list,
+          for which the resolved page range is empty
+
+        What it verifies:
+        - No IndexError from the empty page range
+        - Every results list is empty
+
+        Key insight: A 0-page PDF resolves to the page range (1, 0), so the
+        page iteration must cope with an empty list of page numbers.
+        """
+        monkeypatch.setattr(plumb3.pdfplumber, "open", lambda path: FakePDF([]))
+
+        results = plumb3.extract_three_methods("empty.pdf")
+
+        assert results is not None
+        assert all(entries == [] for entries in results.values())
+
+
+class TestWriteJson:
+    """Test plumb3.write_json's replace-when-complete output."""
+
+    def test_failed_write_keeps_existing_output(self, temp_output_dir):
+        """Test write_json() leaves no temporary file and keeps the old output when encoding fails.
+
+        Test setup:
+        - An existing output file from an earlier run
+        - Data holding a value JSON cannot encode (a set)
+
+        What it verifies:
+        - The encoding error is raised to the caller
+        - The existing output file is unchanged
+        - No <path>.tmp file is left next to it
+
+        Key insight: The output is written to a temporary file first, which
+        must be cleaned up when the write does not complete.
+        """
+        path = temp_output_dir / "results.json"
+        path.write_text('{"old": true}')
+
+        with pytest.raises(TypeError):
+            plumb3.write_json(str(path), {"bad": {1, 2}})
+
+        assert path.read_text() == '{"old": true}'
+        assert list(temp_output_dir.iterdir()) == [path]
+
+    def test_writes_output(self, temp_output_dir):
+        """Test write_json() writes the data and removes the temporary file."""
+        path = temp_output_dir / "results.json"
+
+        plumb3.write_json(str(path), {"pages": [1, 2]})
+
+        assert plumb3.json.loads(path.read_text()) == {"pages": [1, 2]}
+        assert list(temp_output_dir.iterdir()) == [path]
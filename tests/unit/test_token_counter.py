@@ -0,0 +1,197 @@
+"""Unit tests for token counting utilities."""
+
+import json
+import statistics
+
+import pytest
+
+pytest.importorskip("tiktoken")
+
+from src.pdf_plumb.utils.token_counter import TokenCounter, DocumentTokenAnalyzer
+
+
+SAMPLE_TEXTS = [
+    "H.264 Advanced Video Coding",
+    "",
+    "Table of Contents\n1 Scope ........ 1\n2 Normative references ........ 2",
+    '{"page": 1, "lines": [{"text": "Header", "bbox": [72.0, 36.5, 540.0, 48.2]}]}',
+    "Ünïcödé text — with “quotes” and symbols: ≤ ≥ ±",
+]
+
+
+@pytest.fixture
+def document_file(temp_output_dir):
+    """Write a 12-page lines document with pages of varying size."""
+    pages = [
+        {
+            "page": page_num,
+            "lines": [
+                {"line_number": n, "text": f"Line {n} of page {page_num}", "bbox": [72.0, 100.0 + n * 12, 540.0, 110.0 + n * 12]}
+                for n in range(1, page_num * 3)
+            ],
+        }
+        for page_num in range(1, 13)
+    ]
+    path = temp_output_dir / "document_lines.json"
+    path.write_text(json.dumps({"pages": pages}))
+    return path
+
+
+class TestCountTokensBatch:
+    """Test the TokenCounter.count_tokens_batch method."""
+
+    def test_batch_matches_single_counts(self):
+        """Test count_tokens_batch() returns the same counts as count_tokens() for each text.
+
+        Test setup:
+        - Plain prose, an empty string, multi-line text, page JSON and non-ASCII text
+        - Counted once in a single batch and once text by text
+
+        What it verifies:
+        - One count per input text, in input order
+        - Each batch count equals the single-text count
+
+        Key insight: The batch encoder must be a drop-in replacement for
+        counting pages one at a time.
+        """
+        counter = TokenCounter()
+
+        batch_counts = counter.count_tokens_batch(SAMPLE_TEXTS)
+
+        assert batch_counts == [counter.count_tokens(text) for text in SAMPLE_TEXTS]
+
+    @pytest.mark.parametrize("num_threads", [1, 2, 8])
+    def test_batch_independent_of_thread_count(self, num_threads):
+        """Test count_tokens_batch() counts do not depend on the number of encoder threads."""
+        counter = TokenCounter()
+
+        assert counter.count_tokens_batch(SAMPLE_TEXTS, num_threads) == counter.count_tokens_batch(SAMPLE_TEXTS, 1)
+
+    def test_empty_batch(self):
+        """Test count_tokens_batch() returns an empty list for no texts."""
+        assert TokenCounter().count_tokens_batch([]) == []
+
+
+class TestAnalyzeDocument:
+    """Test DocumentTokenAnalyzer.analyze_document with batch token counting."""
+
+    @pytest.mark.parametrize("num_threads", [None, 1, 4])
+    def test_stats_match_per_page_counts(self, document_file, num_threads):
+        """Test analyze_document() statistics match counting each sampled page on its own.
+
+        Test setup:
+        - 12-page document; first 5 pages plus 4 random pages from page 6 on
+        - Expected statistics built from count_page_tokens() on each sampled page
+
+        What it verifies:
+        - detailed_stats holds each sampled page's count_page_tokens() values,
+          with no page marked as estimated
+        - token_stats (min, max, mean, median, std_dev, total) match the
+          per-page counts
+        - The result is the same for any num_threads
+
+        Key insight: Batching the tokenizer calls must not change the
+        analysis results.
+        """
+        analyzer = DocumentTokenAnalyzer(num_threads=num_threads)
+
+        results = analyzer.analyze_document(
+            str(document_file), first_n_pages=5, random_sample_size=4, random_start_page=6
+        )
+
+        pages = json.loads(document_file.read_text())["pages"]
+        expected_pages = [
+            {**analyzer.count_page_tokens(pages[page_num - 1]), "estimated": False}
+            for page_num in results["sample_pages"]
+        ]
+        assert results["sample_pages"][:5] == [1, 2, 3, 4, 5]
+        assert len(results["sample_pages"]) == 9
+        assert results["detailed_stats"] == expected_pages
+        for page_num, page in zip(results["sample_pages"], results["detailed_stats"]):
+            page_json = json.dumps(pages[page_num - 1])
+            assert page["page_number"] == page_num
+            assert page["raw_length"] == len(page_json)
+            assert page["block_count"] == len(pages[page_num - 1]["lines"])
+            assert page["total_tokens"] == analyzer.counter.count_tokens(page_json)
+
+        counts = [page["total_tokens"] for page in expected_pages]
+        assert results["token_stats"] == {
+            "min": min(counts),
+            "max": max(counts),
+            "mean": statistics.mean(counts),
+            "median": statistics.median(counts),
+            "std_dev": statistics.stdev(counts),
+            "total_sample": sum(counts),
+        }
+        assert results["sampling_strategy"]["estimated_pages"] == 0
+
+
+class TestCalibrationEstimate:
+    """Test analyze_document's calibration_pages token estimate."""
+
+    def test_estimates_uncalibrated_pages(self, document_file):
+        """Test analyze_document() with calibration_pages tokenizes only that many pages.
+
+        Test setup:
+        - 12-page document; first 5 pages plus 4 random pages sampled (9 pages)
+        - calibration_pages=3, so 6 pages are estimated
+
+        What it verifies:
+        - Calibration pages are evenly spread over the sample (indices 0, 3, 6)
+          and have their exact count_page_tokens() counts
+        - Every other page is estimated from its JSON length using the
+          calibration pages' tokens-per-character ratio
+        - sampling_strategy reports the number of estimated pages
+
+        Key insight: The estimate must stay anchored to real token counts
+        taken across the whole sample.
+        """
+        analyzer = DocumentTokenAnalyzer()
+
+        results = analyzer.analyze_document(
+            str(document_file), first_n_pages=5, random_sample_size=4, random_start_page=6,
+            calibration_pages=3
+        )
+
+        pages = json.loads(document_file.read_text())["pages"]
+        exact = [analyzer.count_page_tokens(pages[page_num - 1]) for page_num in results["sample_pages"]]
+        stats = results["detailed_stats"]
+        calibration = [i for i, page in enumerate(stats) if not page["estimated"]]
+        assert calibration == [0, 3, 6]
+        assert results["sampling_strategy"]["estimated_pages"] == 6
+
+        tokens_per_char = sum(exact[i]["total_tokens"] for i in calibration) / sum(
+            exact[i]["raw_length"] for i in calibration
+        )
+        for i, page in enumerate(stats):
+            assert page["raw_length"] == exact[i]["raw_length"]
+            if i in calibration:
+                assert page["total_tokens"] == exact[i]["total_tokens"]
+            else:
+                assert page["total_tokens"] == round(page["raw_length"] * tokens_per_char)
+        assert results["token_stats"]["total_sample"] == sum(page["total_tokens"] for page in stats)
+
+    def test_calibration_spread_over_sample(self, document_file):
+        """Test calibration pages span the sample when more than half the pages are calibrated."""
+        results = DocumentTokenAnalyzer().analyze_document(
+            str(document_file), first_n_pages=5, random_sample_size=4, random_start_page=6,
+            calibration_pages=5
+        )
+
+        calibration = [i for i, page in enumerate(results["detailed_stats"]) if not page["estimated"]]
+        assert calibration == [0, 2, 4, 5, 7]
+
+    def test_calibration_not_below_sample_size(self, document_file):
+        """Test every page is tokenized when calibration_pages covers the whole sample."""
+        results = DocumentTokenAnalyzer().analyze_document(
+            str(document_file), first_n_pages=5, random_sample_size=4, random_start_page=6,
+            calibration_pages=9
+        )
+
+        assert results["sampling_strategy"]["estimated_pages"] == 0
+
+    @pytest.mark.parametrize("calibration_pages", [0, -1])
+    def test_rejects_non_positive_calibration_pages(self, document_file, calibration_pages):
+        """Test analyze_document() raises ValueError for calibration_pages below 1."""
+        with pytest.raises(ValueError, match="calibration_pages"):
+            DocumentTokenAnalyzer().analyze_document(str(document_file), calibration_pages=calibration_pages)